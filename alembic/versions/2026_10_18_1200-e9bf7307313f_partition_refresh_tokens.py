@@ -0,0 +1,156 @@
+"""Partition refresh_tokens by expires_at month
+
+Revision ID: e9bf7307313f
+Revises: 2e83ec6dc6b7
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e9bf7307313f"
+down_revision: Union[str, Sequence[str], None] = "2e83ec6dc6b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Секции вперед от текущего месяца (срок жизни refresh токена - 30 дней)
+MONTHS_AHEAD = 3
+# Строки без expires_at живут столько же, сколько новый refresh токен
+DEFAULT_LIFETIME = "interval '30 days'"
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table("refresh_tokens", "refresh_tokens_old")
+    op.execute("ALTER INDEX ix_refresh_tokens_id RENAME TO ix_refresh_tokens_old_id")
+    op.execute("ALTER INDEX ix_refresh_tokens_jti RENAME TO ix_refresh_tokens_old_jti")
+    op.execute(
+        "ALTER TABLE refresh_tokens_old "
+        "RENAME CONSTRAINT refresh_tokens_pkey TO refresh_tokens_old_pkey"
+    )
+    # Последовательность id переходит к новой таблице
+    op.execute("ALTER SEQUENCE refresh_tokens_id_seq OWNED BY NONE")
+
+    op.create_table(
+        "refresh_tokens",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('refresh_tokens_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("jti", sa.String(), nullable=False),
+        sa.Column("revoke", sa.Boolean(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", "expires_at"),
+        postgresql_partition_by="RANGE (expires_at)",
+    )
+    op.execute("ALTER SEQUENCE refresh_tokens_id_seq OWNED BY refresh_tokens.id")
+    op.create_index(
+        "ix_refresh_tokens_jti",
+        "refresh_tokens",
+        ["jti", "expires_at"],
+        unique=True,
+        postgresql_include=["revoke", "user_id"],
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_user_id"), "refresh_tokens", ["user_id"], unique=False
+    )
+
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    for offset in range(MONTHS_AHEAD + 1):
+        month = _add_months(current, offset)
+        op.execute(
+            f"CREATE TABLE refresh_tokens_y{month.year}m{month.month:02d} "
+            f"PARTITION OF refresh_tokens "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') "
+            f"TO ('{_add_months(month, 1).isoformat()} 00:00+00')"
+        )
+
+    # Переносим только живые токены: истекшие больше не нужны.
+    # exp в JWT - целые секунды, и поиск идет по expires_at == exp:
+    # отбрасываем микросекунды, иначе старые токены не найдутся
+    op.execute(
+        f"""
+        INSERT INTO refresh_tokens (id, jti, revoke, expires_at, created_at, user_id)
+        SELECT id, jti, revoke,
+               date_trunc('second', COALESCE(expires_at, created_at + {DEFAULT_LIFETIME})),
+               created_at, user_id
+        FROM refresh_tokens_old
+        WHERE COALESCE(expires_at, created_at + {DEFAULT_LIFETIME}) > now()
+        """
+    )
+    op.drop_table("refresh_tokens_old")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table("refresh_tokens", "refresh_tokens_partitioned")
+    op.execute("ALTER SEQUENCE refresh_tokens_id_seq OWNED BY NONE")
+    op.execute(
+        "ALTER INDEX ix_refresh_tokens_jti RENAME TO ix_refresh_tokens_partitioned_jti"
+    )
+    op.execute(
+        "ALTER INDEX ix_refresh_tokens_user_id "
+        "RENAME TO ix_refresh_tokens_partitioned_user_id"
+    )
+    op.execute(
+        "ALTER TABLE refresh_tokens_partitioned "
+        "RENAME CONSTRAINT refresh_tokens_pkey TO refresh_tokens_partitioned_pkey"
+    )
+
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("jti", sa.String(), nullable=False),
+        sa.Column("revoke", sa.Boolean(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('refresh_tokens_id_seq')"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("ALTER SEQUENCE refresh_tokens_id_seq OWNED BY refresh_tokens.id")
+    op.create_index(
+        op.f("ix_refresh_tokens_id"), "refresh_tokens", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_jti"), "refresh_tokens", ["jti"], unique=True
+    )
+    op.execute(
+        """
+        INSERT INTO refresh_tokens (id, jti, revoke, expires_at, created_at, user_id)
+        SELECT id, jti, revoke, expires_at, created_at, user_id
+        FROM refresh_tokens_partitioned
+        """
+    )
+    op.drop_table("refresh_tokens_partitioned")
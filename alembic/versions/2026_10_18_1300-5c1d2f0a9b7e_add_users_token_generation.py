@@ -0,0 +1,38 @@
+"""Add users.token_generation
+
+Revision ID: 5c1d2f0a9b7e
+Revises: e9bf7307313f
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d2f0a9b7e"
+down_revision: Union[str, Sequence[str], None] = "e9bf7307313f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # server_default - без перезаписи таблицы (Postgres 11+)
+    op.add_column(
+        "users",
+        sa.Column(
+            "token_generation",
+            sa.Integer(),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "token_generation")
@@ -0,0 +1,32 @@
+"""Add refresh_tokens.revoked_at
+
+Revision ID: 8a3e6b41d2c9
+Revises: 5c1d2f0a9b7e
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8a3e6b41d2c9"
+down_revision: Union[str, Sequence[str], None] = "5c1d2f0a9b7e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "refresh_tokens",
+        sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("refresh_tokens", "revoked_at")
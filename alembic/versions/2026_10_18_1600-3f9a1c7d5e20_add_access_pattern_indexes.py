@@ -0,0 +1,93 @@
+"""Add composite and partial indexes for list queries
+
+Revision ID: 3f9a1c7d5e20
+Revises: b47c0e2d6f18
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c7d5e20"
+down_revision: Union[str, Sequence[str], None] = "b47c0e2d6f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя, таблица, колонки, условие частичного индекса)
+INDEXES = [
+    # WHERE user_id = ? ORDER BY created_at DESC - обратный проход по индексу
+    ("ix_tasks_user_id_created_at", "tasks", "user_id, created_at, id", None),
+    ("ix_notes_user_id_created_at", "notes", "user_id, created_at, id", None),
+    # Комментарий относится либо к задаче, либо к заметке
+    (
+        "ix_comments_task_id_created_at",
+        "comments",
+        "task_id, created_at, id",
+        "task_id IS NOT NULL",
+    ),
+    (
+        "ix_comments_note_id_created_at",
+        "comments",
+        "note_id, created_at, id",
+        "note_id IS NOT NULL",
+    ),
+]
+
+# Отозванные токены для загрузки индекса отзыва при старте
+REFRESH_TOKENS_REVOKED = "ix_refresh_tokens_revoked"
+
+
+def _partitions(parent: str) -> list[str]:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ),
+        {"parent": parent},
+    )
+    return list(result.scalars())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не работает внутри транзакции, зато не блокирует запись
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            # Прерванный CONCURRENTLY оставляет невалидный индекс - пересоздаем
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY {name} ON {table} ({columns})"
+                + (f" WHERE {where}" if where else "")
+            )
+
+        # На секционированной таблице CONCURRENTLY недоступен: создаем пустой
+        # индекс ON ONLY на родителе и подключаем к нему индексы секций
+        op.execute(f"DROP INDEX IF EXISTS {REFRESH_TOKENS_REVOKED}")
+        op.execute(
+            f"CREATE INDEX {REFRESH_TOKENS_REVOKED} ON ONLY refresh_tokens "
+            "(expires_at) INCLUDE (jti) WHERE revoke"
+        )
+        for partition in _partitions("refresh_tokens"):
+            name = f"{partition}_revoked_idx"
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY {name} ON {partition} "
+                "(expires_at) INCLUDE (jti) WHERE revoke"
+            )
+            op.execute(f"ALTER INDEX {REFRESH_TOKENS_REVOKED} ATTACH PARTITION {name}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        # Индексы секций удаляются вместе с родительским
+        op.execute(f"DROP INDEX IF EXISTS {REFRESH_TOKENS_REVOKED}")
+        for name, _, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
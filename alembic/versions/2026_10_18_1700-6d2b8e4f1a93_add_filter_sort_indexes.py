@@ -0,0 +1,60 @@
+"""Add indexes for task and note filters and sorting
+
+Revision ID: 6d2b8e4f1a93
+Revises: 3f9a1c7d5e20
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6d2b8e4f1a93"
+down_revision: Union[str, Sequence[str], None] = "3f9a1c7d5e20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя, таблица, колонки)
+INDEXES = [
+    # sort=updated_at
+    ("ix_tasks_user_id_updated_at", "tasks", "user_id, updated_at, id"),
+    # sort=title
+    ("ix_tasks_user_id_title", "tasks", "user_id, title, id"),
+    # title_prefix: LIKE 'abc%' не использует индекс с обычной сортировкой строк
+    (
+        "ix_tasks_user_id_title_pattern",
+        "tasks",
+        "user_id, title varchar_pattern_ops",
+    ),
+    # is_completed вместе с сортировкой по умолчанию
+    (
+        "ix_tasks_user_id_is_completed_created_at",
+        "tasks",
+        "user_id, is_completed, created_at, id",
+    ),
+    ("ix_notes_user_id_updated_at", "notes", "user_id, updated_at, id"),
+    (
+        "ix_notes_user_id_is_important_created_at",
+        "notes",
+        "user_id, is_important, created_at, id",
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            # Прерванный CONCURRENTLY оставляет невалидный индекс - пересоздаем
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(f"CREATE INDEX CONCURRENTLY {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,59 @@
+"""Add generated tsvector columns for full-text search
+
+Revision ID: 9c4e7a2b5d16
+Revises: 6d2b8e4f1a93
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4e7a2b5d16"
+down_revision: Union[str, Sequence[str], None] = "6d2b8e4f1a93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Выражения должны совпадать с core.models.search.search_vector
+VECTORS = {
+    "tasks": "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+    "notes": "setweight(to_tsvector('simple', coalesce(content, '')), 'A')",
+    "comments": "setweight(to_tsvector('simple', coalesce(content, '')), 'A')",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # STORED колонка переписывает таблицу под ACCESS EXCLUSIVE блокировкой,
+    # на больших таблицах миграцию нужно запускать в окно обслуживания
+    for table, expression in VECTORS.items():
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(expression, persisted=True),
+                nullable=False,
+            ),
+        )
+
+    with op.get_context().autocommit_block():
+        for table in VECTORS:
+            name = f"ix_{table}_search_vector"
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY {name} ON {table} USING gin (search_vector)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(list(VECTORS)):
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
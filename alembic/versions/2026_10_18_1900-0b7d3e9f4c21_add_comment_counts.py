@@ -0,0 +1,99 @@
+"""Add comment_count to tasks and notes maintained by triggers
+
+Revision ID: 0b7d3e9f4c21
+Revises: 9c4e7a2b5d16
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0b7d3e9f4c21"
+down_revision: Union[str, Sequence[str], None] = "9c4e7a2b5d16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблица родителя, колонка в comments)
+PARENTS = [("tasks", "task_id"), ("notes", "note_id")]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in PARENTS:
+        op.add_column(
+            table,
+            sa.Column(
+                "comment_count",
+                sa.Integer(),
+                server_default="0",
+                nullable=False,
+            ),
+        )
+        op.execute(
+            f"""
+            UPDATE {table} p SET comment_count = c.n
+            FROM (
+                SELECT {column} AS id, count(*) AS n FROM comments
+                WHERE {column} IS NOT NULL GROUP BY {column}
+            ) c
+            WHERE p.id = c.id
+            """
+        )
+
+    # Триггеры уровня оператора: многострочный INSERT/DELETE (batch, COPY,
+    # каскадное удаление) обновляет каждого родителя одним UPDATE
+    op.execute(
+        """
+        CREATE FUNCTION comments_count_changed() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            delta integer := CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END;
+        BEGIN
+            UPDATE tasks t SET comment_count = t.comment_count + delta * c.n
+            FROM (
+                SELECT task_id, count(*) AS n FROM changed_rows
+                WHERE task_id IS NOT NULL GROUP BY task_id
+            ) c
+            WHERE t.id = c.task_id;
+
+            UPDATE notes n SET comment_count = n.comment_count + delta * c.n
+            FROM (
+                SELECT note_id, count(*) AS n FROM changed_rows
+                WHERE note_id IS NOT NULL GROUP BY note_id
+            ) c
+            WHERE n.id = c.note_id;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER comments_count_insert
+        AFTER INSERT ON comments
+        REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION comments_count_changed()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER comments_count_delete
+        AFTER DELETE ON comments
+        REFERENCING OLD TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION comments_count_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS comments_count_delete ON comments")
+    op.execute("DROP TRIGGER IF EXISTS comments_count_insert ON comments")
+    op.execute("DROP FUNCTION IF EXISTS comments_count_changed()")
+    for table, _ in reversed(PARENTS):
+        op.drop_column(table, "comment_count")
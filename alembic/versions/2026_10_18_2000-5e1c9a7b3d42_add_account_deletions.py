@@ -0,0 +1,87 @@
+"""Add account_deletions queue and comments user_id index
+
+Revision ID: 5e1c9a7b3d42
+Revises: 0b7d3e9f4c21
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e1c9a7b3d42"
+down_revision: Union[str, Sequence[str], None] = "0b7d3e9f4c21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status IN ('pending', 'running')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "account_deletions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("token", sa.String(length=64), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status", sa.String(length=16), server_default="pending", nullable=False
+        ),
+        sa.Column("deleted_rows", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("token"),
+    )
+    op.create_index(
+        op.f("ix_account_deletions_id"), "account_deletions", ["id"], unique=False
+    )
+    op.create_index(
+        "ix_account_deletions_user_id_active",
+        "account_deletions",
+        ["user_id"],
+        unique=True,
+        postgresql_where=ACTIVE,
+    )
+    op.create_index(
+        "ix_account_deletions_queue",
+        "account_deletions",
+        ["created_at"],
+        postgresql_where=ACTIVE,
+    )
+
+    # Без индекса по user_id каскад от users и порции воркера читают
+    # comments целиком
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_comments_user_id")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_comments_user_id ON comments (user_id)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_comments_user_id")
+
+    op.drop_index("ix_account_deletions_queue", table_name="account_deletions")
+    op.drop_index("ix_account_deletions_user_id_active", table_name="account_deletions")
+    op.drop_index(op.f("ix_account_deletions_id"), table_name="account_deletions")
+    op.drop_table("account_deletions")
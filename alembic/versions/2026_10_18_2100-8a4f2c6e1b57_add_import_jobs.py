@@ -0,0 +1,115 @@
+"""Add import jobs, row errors and COPY staging tables
+
+Revision ID: 8a4f2c6e1b57
+Revises: 5e1c9a7b3d42
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4f2c6e1b57"
+down_revision: Union[str, Sequence[str], None] = "5e1c9a7b3d42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("format", sa.String(length=16), nullable=False),
+        sa.Column(
+            "status", sa.String(length=16), server_default="running", nullable=False
+        ),
+        sa.Column(
+            "processed_rows", sa.BigInteger(), server_default="0", nullable=False
+        ),
+        sa.Column("failed_rows", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("imported_rows", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_import_jobs_id"), "import_jobs", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_import_jobs_user_id"), "import_jobs", ["user_id"], unique=False
+    )
+
+    op.create_table(
+        "import_job_errors",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("line", sa.Integer(), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["import_jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_import_job_errors_id"), "import_job_errors", ["id"], unique=False
+    )
+    op.create_index(
+        "ix_import_job_errors_job_id_line",
+        "import_job_errors",
+        ["job_id", "line", "id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "import_staging_tasks",
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("line", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        op.f("ix_import_staging_tasks_job_id"),
+        "import_staging_tasks",
+        ["job_id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "import_staging_notes",
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("line", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("is_important", sa.Boolean(), nullable=False),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        op.f("ix_import_staging_notes_job_id"),
+        "import_staging_notes",
+        ["job_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("import_staging_notes")
+    op.drop_table("import_staging_tasks")
+    op.drop_table("import_job_errors")
+    op.drop_table("import_jobs")
@@ -0,0 +1,127 @@
+"""Add per-user change versions and touch parents on comment changes
+
+Revision ID: c3d8e5a1f694
+Revises: 8a4f2c6e1b57
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d8e5a1f694"
+down_revision: Union[str, Sequence[str], None] = "8a4f2c6e1b57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблица, вид в user_change_versions)
+VERSIONED = [("tasks", "task"), ("notes", "note")]
+# Операция -> какая таблица переходов содержит измененные строки
+TRANSITIONS = [("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")]
+
+COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION comments_count_changed() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    delta integer := CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END;
+BEGIN
+    UPDATE tasks t SET comment_count = t.comment_count + delta * c.n{touch}
+    FROM (
+        SELECT task_id, count(*) AS n FROM changed_rows
+        WHERE task_id IS NOT NULL GROUP BY task_id
+    ) c
+    WHERE t.id = c.task_id;
+
+    UPDATE notes n SET comment_count = n.comment_count + delta * c.n{touch}
+    FROM (
+        SELECT note_id, count(*) AS n FROM changed_rows
+        WHERE note_id IS NOT NULL GROUP BY note_id
+    ) c
+    WHERE n.id = c.note_id;
+    RETURN NULL;
+END;
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Без внешнего ключа: при каскадном удалении пользователя триггеры
+    # пишут сюда уже после удаления строки users
+    op.create_table(
+        "user_change_versions",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "kind"),
+    )
+
+    # Комментарии - часть представления родителя: comment_count и
+    # ?include=comments. Любое их изменение сдвигает updated_at родителя
+    op.execute(COUNT_FUNCTION.format(touch=", updated_at = now()"))
+    op.execute(
+        """
+        CREATE FUNCTION comments_touch_parents() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE tasks SET updated_at = now()
+            WHERE id IN (SELECT task_id FROM changed_rows);
+            UPDATE notes SET updated_at = now()
+            WHERE id IN (SELECT note_id FROM changed_rows);
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER comments_touch_update
+        AFTER UPDATE ON comments
+        REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION comments_touch_parents()
+        """
+    )
+
+    # Одна строка на (пользователь, вид) за оператор, а не за строку
+    op.execute(
+        """
+        CREATE FUNCTION bump_change_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO user_change_versions (user_id, kind, version)
+            SELECT DISTINCT user_id, TG_ARGV[0], 1 FROM changed_rows
+            ON CONFLICT (user_id, kind)
+            DO UPDATE SET version = user_change_versions.version + 1;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    for table, kind in VERSIONED:
+        for operation, transition in TRANSITIONS:
+            op.execute(
+                f"""
+                CREATE TRIGGER {table}_version_{operation.lower()}
+                AFTER {operation} ON {table}
+                REFERENCING {transition} TABLE AS changed_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_change_version('{kind}')
+                """
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _ in reversed(VERSIONED):
+        for operation, _ in reversed(TRANSITIONS):
+            op.execute(
+                f"DROP TRIGGER IF EXISTS {table}_version_{operation.lower()} ON {table}"
+            )
+    op.execute("DROP FUNCTION IF EXISTS bump_change_version()")
+    op.execute("DROP TRIGGER IF EXISTS comments_touch_update ON comments")
+    op.execute("DROP FUNCTION IF EXISTS comments_touch_parents()")
+    op.execute(COUNT_FUNCTION.format(touch=""))
+    op.drop_table("user_change_versions")
@@ -0,0 +1,69 @@
+"""Add revoked_at to ix_refresh_tokens_jti INCLUDE
+
+Revision ID: d5a2b8e0c7f3
+Revises: c3d8e5a1f694
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a2b8e0c7f3"
+down_revision: Union[str, Sequence[str], None] = "c3d8e5a1f694"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REFRESH_TOKENS_JTI = "ix_refresh_tokens_jti"
+REBUILT = "ix_refresh_tokens_jti_rebuilt"
+
+
+def _partitions(parent: str) -> list[str]:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ),
+        {"parent": parent},
+    )
+    return list(result.scalars())
+
+
+def _rebuild(include: str, suffix: str) -> None:
+    # Новый индекс строим рядом со старым: ON ONLY на родителе и CONCURRENTLY
+    # на каждой секции, затем подменяем старый. Поиск по jti не прерывается
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX IF EXISTS {REBUILT}")
+        op.execute(
+            f"CREATE UNIQUE INDEX {REBUILT} ON ONLY refresh_tokens "
+            f"(jti, expires_at) INCLUDE ({include})"
+        )
+        for partition in _partitions("refresh_tokens"):
+            name = f"{partition}_{suffix}"
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY {name} ON {partition} "
+                f"(jti, expires_at) INCLUDE ({include})"
+            )
+            op.execute(f"ALTER INDEX {REBUILT} ATTACH PARTITION {name}")
+
+    # Индексы секций удаляются вместе с родительским
+    op.execute(f"DROP INDEX {REFRESH_TOKENS_JTI}")
+    op.execute(f"ALTER INDEX {REBUILT} RENAME TO {REFRESH_TOKENS_JTI}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # revoked_at читается при повторном использовании токена - только из индекса
+    _rebuild("revoke, user_id, revoked_at", "jti_revoked_at_idx")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild("revoke, user_id", "jti_idx")
@@ -0,0 +1,35 @@
+"""Truncate refresh_tokens.expires_at to whole seconds
+
+Revision ID: 7b0e4d9a2c16
+Revises: d5a2b8e0c7f3
+Create Date: 2026-10-18 23:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b0e4d9a2c16"
+down_revision: Union[str, Sequence[str], None] = "d5a2b8e0c7f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Токены, перенесенные при секционировании, сохранили микросекунды
+    # в expires_at и не совпадают с exp из JWT. Новые записи уже округлены.
+    # Смена ключа секционирования сама переносит строку в нужную секцию
+    op.execute(
+        "UPDATE refresh_tokens SET expires_at = date_trunc('second', expires_at) "
+        "WHERE expires_at <> date_trunc('second', expires_at)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Исходные микросекунды не восстановить, да и не нужно
+    pass
@@ -0,0 +1,37 @@
+"""Add partial index for interrupted import cleanup
+
+Revision ID: 4c9f1e7a3b85
+Revises: 7b0e4d9a2c16
+Create Date: 2026-10-18 23:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c9f1e7a3b85"
+down_revision: Union[str, Sequence[str], None] = "7b0e4d9a2c16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+IMPORT_JOBS_RUNNING = "ix_import_jobs_running"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не работает внутри транзакции, зато не блокирует запись
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {IMPORT_JOBS_RUNNING}")
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY {IMPORT_JOBS_RUNNING} ON import_jobs "
+            "(updated_at) WHERE status = 'running'"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {IMPORT_JOBS_RUNNING}")
@@ -0,0 +1,78 @@
+"""Add refresh_tokens.revoke_reason, keep rotated tokens out of the revocation index
+
+Revision ID: 9d3b6f2a8c41
+Revises: 4c9f1e7a3b85
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d3b6f2a8c41"
+down_revision: Union[str, Sequence[str], None] = "4c9f1e7a3b85"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REFRESH_TOKENS_REVOKED = "ix_refresh_tokens_revoked"
+REBUILT = "ix_refresh_tokens_revoked_rebuilt"
+
+
+def _partitions(parent: str) -> list[str]:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ),
+        {"parent": parent},
+    )
+    return list(result.scalars())
+
+
+def _rebuild(where: str, suffix: str) -> None:
+    # Новый индекс строим рядом со старым: ON ONLY на родителе и CONCURRENTLY
+    # на каждой секции, затем подменяем старый
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX IF EXISTS {REBUILT}")
+        op.execute(
+            f"CREATE INDEX {REBUILT} ON ONLY refresh_tokens "
+            f"(expires_at) INCLUDE (jti) WHERE {where}"
+        )
+        for partition in _partitions("refresh_tokens"):
+            name = f"{partition}_{suffix}"
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY {name} ON {partition} "
+                f"(expires_at) INCLUDE (jti) WHERE {where}"
+            )
+            op.execute(f"ALTER INDEX {REBUILT} ATTACH PARTITION {name}")
+
+    # Индексы секций удаляются вместе с родительским
+    op.execute(f"DROP INDEX {REFRESH_TOKENS_REVOKED}")
+    op.execute(f"ALTER INDEX {REBUILT} RENAME TO {REFRESH_TOKENS_REVOKED}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Без значения по умолчанию - только изменение каталога.
+    # Уже отозванные строки остаются с NULL и грузятся, пока не истекут
+    op.add_column(
+        "refresh_tokens",
+        sa.Column("revoke_reason", sa.String(length=16), nullable=True),
+    )
+    _rebuild(
+        "revoke AND revoke_reason IS DISTINCT FROM 'rotated'",
+        "revoked_logout_idx",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild("revoke", "revoked_idx")
+    op.drop_column("refresh_tokens", "revoke_reason")
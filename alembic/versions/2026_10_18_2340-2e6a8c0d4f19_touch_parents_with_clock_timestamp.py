@@ -0,0 +1,71 @@
+"""Touch parents of changed comments with clock_timestamp()
+
+Revision ID: 2e6a8c0d4f19
+Revises: 9d3b6f2a8c41
+Create Date: 2026-10-18 23:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2e6a8c0d4f19"
+down_revision: Union[str, Sequence[str], None] = "9d3b6f2a8c41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION comments_count_changed() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    delta integer := CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END;
+BEGIN
+    UPDATE tasks t SET comment_count = t.comment_count + delta * c.n,
+        updated_at = {stamp}
+    FROM (
+        SELECT task_id, count(*) AS n FROM changed_rows
+        WHERE task_id IS NOT NULL GROUP BY task_id
+    ) c
+    WHERE t.id = c.task_id;
+
+    UPDATE notes n SET comment_count = n.comment_count + delta * c.n,
+        updated_at = {stamp}
+    FROM (
+        SELECT note_id, count(*) AS n FROM changed_rows
+        WHERE note_id IS NOT NULL GROUP BY note_id
+    ) c
+    WHERE n.id = c.note_id;
+    RETURN NULL;
+END;
+$$
+"""
+
+TOUCH_FUNCTION = """
+CREATE OR REPLACE FUNCTION comments_touch_parents() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks SET updated_at = {stamp}
+    WHERE id IN (SELECT task_id FROM changed_rows);
+    UPDATE notes SET updated_at = {stamp}
+    WHERE id IN (SELECT note_id FROM changed_rows);
+    RETURN NULL;
+END;
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # updated_at - валидатор If-Modified-Since. now() - начало транзакции:
+    # долгая транзакция записала бы время старше уже видимых изменений
+    op.execute(COUNT_FUNCTION.format(stamp="clock_timestamp()"))
+    op.execute(TOUCH_FUNCTION.format(stamp="clock_timestamp()"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(TOUCH_FUNCTION.format(stamp="now()"))
+    op.execute(COUNT_FUNCTION.format(stamp="now()"))
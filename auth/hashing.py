@@ -1,13 +1,29 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
 import bcrypt
 
+from core.config import settings
+from core.exceptions.auth import PasswordHashingBusyException
+
+
+log = logging.getLogger(__name__)
+
+# Минимально допустимый cost bcrypt
+MIN_ROUNDS = 12
+
 
 class HashingPassword:
     # Хэшируем пароль
     @staticmethod
     def hash_password(
         password: str,
+        rounds: int = MIN_ROUNDS,
     ) -> str:
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=rounds)
         pwd_bytes: bytes = password.encode()
         hashed_bytes = bcrypt.hashpw(pwd_bytes, salt)
         return hashed_bytes.decode()
@@ -23,5 +39,152 @@ class HashingPassword:
             hashed_password=hashed_password.encode(),
         )
 
+    # Cost хэша: "$2b$12$..." -> 12
+    @staticmethod
+    def get_rounds(
+        hashed_password: str,
+    ) -> int:
+        return int(hashed_password.split("$")[2])
+
+    # Подбираем максимальный cost, укладывающийся в целевую задержку
+    @staticmethod
+    def calibrate_rounds(
+        target_ms: float,
+        min_rounds: int = MIN_ROUNDS,
+        max_rounds: int = 16,
+    ) -> int:
+        rounds = max(min_rounds, MIN_ROUNDS)
+        elapsed_ms = HashingPassword._measure(rounds)
+        # Каждый следующий cost вдвое дороже предыдущего
+        while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+            rounds += 1
+            elapsed_ms = HashingPassword._measure(rounds)
+        return rounds
+
+    @staticmethod
+    def _measure(rounds: int) -> float:
+        salt = bcrypt.gensalt(rounds=rounds)
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", salt)
+        return (time.perf_counter() - started) * 1000
+
 
 hashing_password = HashingPassword()
+
+
+class PasswordHashingPool:
+    """Отдельный пул для bcrypt, чтобы логины не занимали общий threadpool"""
+
+    def __init__(
+        self,
+        executor: str = "thread",
+        workers: int = 4,
+        max_pending: int = 64,
+        retry_after_seconds: int = 1,
+        rounds: int = MIN_ROUNDS,
+    ) -> None:
+        self.executor_kind = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after_seconds = retry_after_seconds
+        self.rounds = max(rounds, MIN_ROUNDS)
+        self._executor: Executor | None = None
+        # Метрики
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.executor_kind == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="bcrypt",
+            )
+        log.info(
+            "Password hashing pool started: %s x%d", self.executor_kind, self.workers
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def calibrate(
+        self,
+        target_ms: float,
+        min_rounds: int = MIN_ROUNDS,
+        max_rounds: int = 16,
+    ) -> int:
+        # Меряем в том же пуле, где потом будут считаться хэши
+        self.rounds = await self._submit(
+            HashingPassword.calibrate_rounds, target_ms, min_rounds, max_rounds
+        )
+        log.info(
+            "bcrypt cost calibrated to %d (target %.0f ms)", self.rounds, target_ms
+        )
+        return self.rounds
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # Только повышаем cost: иначе узлы с разным железом
+        # перехэшировали бы пароли туда-обратно
+        return HashingPassword.get_rounds(hashed_password) < self.rounds
+
+    async def _submit(self, func, *args):
+        # Очередь ограничена: при перегрузке сразу отвечаем 503
+        if self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHashingBusyException(retry_after=self.retry_after_seconds)
+
+        self.start()
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    async def hash_password(self, password: str) -> str:
+        return await self._submit(HashingPassword.hash_password, password, self.rounds)
+
+    async def validate_password(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(
+            HashingPassword.validate_password, password, hashed_password
+        )
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "rounds": self.rounds,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_latency_ms": (
+                self.total_seconds / self.completed * 1000 if self.completed else 0.0
+            ),
+            "max_latency_ms": self.max_seconds * 1000,
+        }
+
+
+password_hashing_pool = PasswordHashingPool(
+    executor=settings.hashing.executor,
+    workers=settings.hashing.workers,
+    max_pending=settings.hashing.max_pending,
+    retry_after_seconds=settings.hashing.retry_after_seconds,
+    rounds=settings.hashing.rounds or settings.hashing.min_rounds,
+)
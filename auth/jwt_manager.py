@@ -3,6 +3,7 @@ from datetime import timedelta, datetime, timezone
 import jwt
 from jwt import PyJWTError
 
+from auth.keyring import KeyRing, keyring
 from core.config import settings
 from core.exceptions.auth import (
     TokenInvalidException,
@@ -12,12 +13,31 @@ from core.exceptions.auth import (
 
 
 class JwtManager:
+    def __init__(self, keys: KeyRing) -> None:
+        # Ключи уже разобраны, PyJWT не парсит PEM на каждый вызов
+        self.keys = keys
+
+    def _encode(self, payload: dict) -> str:
+        key = self.keys.signing_key()
+        return jwt.encode(
+            payload,
+            key.private_key,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+        )
+
+    def _decode(self, token: str | bytes) -> dict:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keys.verification_key(kid)
+        if key is None:
+            raise TokenInvalidException()
+        # Разрешаем только алгоритм, привязанный к ключу
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
     # Кодируем токен доступа (кодирование, encode)
-    @staticmethod
     def create_access_token(
+        self,
         payload: dict,
-        private_key: str = settings.auth_jwt.private_key_path.read_text(),
-        algorithm: str = settings.auth_jwt.algorithm,
         expire_timedelta: timedelta | None = None,
         expire_minutes: int = settings.auth_jwt.access_token_expire_minutes,
     ) -> str:
@@ -35,7 +55,7 @@ class JwtManager:
                 iat=now,
                 type="access",
             )
-            encoded = jwt.encode(to_encode, private_key, algorithm=algorithm)
+            encoded = self._encode(to_encode)
 
             return encoded
         except Exception as e:
@@ -43,14 +63,12 @@ class JwtManager:
             raise TokenInvalidException()
 
     # Декодируем токен доступа (проверка, валидация)
-    @staticmethod
     def verify_access_token(
+        self,
         token: str | bytes,
-        public_key: str = settings.auth_jwt.public_key_path.read_text(),
-        algorithm: str = settings.auth_jwt.algorithm,
     ) -> dict:
         try:
-            access = jwt.decode(token, public_key, algorithms=[algorithm])
+            access = self._decode(token)
             if access.get("type") != "access":
                 raise TokenTypeException("Expected access token")
 
@@ -63,16 +81,15 @@ class JwtManager:
         except Exception:
             raise TokenInvalidException()
 
-    @staticmethod
     def create_refresh_token(
+        self,
         payload: dict,
-        private_key: str = settings.auth_jwt.private_key_path.read_text(),
-        algorithm: str = settings.auth_jwt.algorithm,
         expire_days: int = settings.auth_jwt.refresh_token_expire_days,
+        expire_at: datetime | None = None,
     ) -> str:
         try:
             now = datetime.now(timezone.utc)
-            expire = now + timedelta(days=expire_days)
+            expire = expire_at or now + timedelta(days=expire_days)
 
             jwt_payload = payload.copy()
             jwt_payload.update(
@@ -81,19 +98,17 @@ class JwtManager:
                 type="refresh",
             )
 
-            return jwt.encode(jwt_payload, private_key, algorithm)
+            return self._encode(jwt_payload)
         except Exception as e:
             # Логируем ошибку создания refresh токена
             raise TokenInvalidException()
 
-    @staticmethod
     def verify_refresh_token(
+        self,
         token: str | bytes,
-        public_key: str = settings.auth_jwt.public_key_path.read_text(),
-        algorithm: str = settings.auth_jwt.algorithm,
     ) -> dict:
         try:
-            refresh = jwt.decode(token, public_key, algorithms=[algorithm])
+            refresh = self._decode(token)
             if refresh.get("type") != "refresh":
                 raise TokenTypeException("Expected refresh token")
 
@@ -106,4 +121,4 @@ class JwtManager:
             raise TokenInvalidException()
 
 
-jwt_manager = JwtManager()
+jwt_manager = JwtManager(keyring)
@@ -0,0 +1,223 @@
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+
+from core.config import settings
+
+
+log = logging.getLogger(__name__)
+
+DEFAULT_KID = "default"
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    public_key: object
+    # У выведенных из ротации ключей остается только публичная часть
+    private_key: object | None = None
+
+
+class KeyRing:
+    """Набор ключей подписи JWT, выбираемых по заголовку kid
+
+    Ключи читаются из каталога один раз и хранятся уже разобранными:
+    `<kid>.pem` - приватный ключ (подпись и проверка),
+    `<kid>.pub.pem` - только публичный ключ (проверка старых токенов).
+    Каталог перечитывается не чаще раза в reload_interval секунд,
+    поэтому ключи можно ротировать без рестарта.
+    """
+
+    def __init__(
+        self,
+        keys_dir: Path | None = None,
+        active_kid: str | None = None,
+        rsa_algorithm: str = "RS256",
+        reload_interval: float = 30,
+        default_private_key_path: Path | None = None,
+        default_public_key_path: Path | None = None,
+    ) -> None:
+        self.keys_dir = keys_dir
+        self.active_kid = active_kid
+        self.rsa_algorithm = rsa_algorithm
+        self.reload_interval = reload_interval
+        self.default_private_key_path = default_private_key_path
+        self.default_public_key_path = default_public_key_path
+
+        self._keys: dict[str, SigningKey] = {}
+        self._signing_kid: str | None = None
+        self._fingerprint: tuple = ()
+        self._checked_at: float | None = None
+
+    # Алгоритм определяется типом ключа, а не заголовком токена
+    def algorithm_for(self, key: object) -> str:
+        if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+            return self.rsa_algorithm
+        if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+            return "EdDSA"
+        if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+            return {
+                "secp256r1": "ES256",
+                "secp384r1": "ES384",
+                "secp521r1": "ES512",
+            }[key.curve.name]
+        raise ValueError(f"Unsupported key type: {type(key).__name__}")
+
+    def add_key(
+        self,
+        kid: str,
+        private_key: object | None = None,
+        public_key: object | None = None,
+    ) -> SigningKey:
+        if public_key is None:
+            public_key = private_key.public_key()
+
+        key = SigningKey(
+            kid=kid,
+            algorithm=self.algorithm_for(public_key),
+            public_key=public_key,
+            private_key=private_key,
+        )
+        self._keys[kid] = key
+        if private_key is not None and self._signing_kid is None:
+            self._signing_kid = kid
+        if self._checked_at is None:
+            self._checked_at = time.monotonic()
+        return key
+
+    def _key_files(self) -> list[Path]:
+        files = []
+        if self.keys_dir is not None and self.keys_dir.is_dir():
+            files.extend(sorted(self.keys_dir.glob("*.pem")))
+        for path in (self.default_private_key_path, self.default_public_key_path):
+            if path is not None and path.is_file():
+                files.append(path)
+        return files
+
+    def load(self) -> None:
+        files = self._key_files()
+        keys: dict[str, SigningKey] = {}
+        newest: tuple[float, str] | None = None
+
+        # Старая пара ключей из настроек доступна под kid "default"
+        if (
+            self.default_private_key_path is not None
+            and self.default_private_key_path.is_file()
+        ):
+            private_key = load_pem_private_key(
+                self.default_private_key_path.read_bytes(), password=None
+            )
+            keys[DEFAULT_KID] = SigningKey(
+                kid=DEFAULT_KID,
+                algorithm=self.algorithm_for(private_key),
+                public_key=private_key.public_key(),
+                private_key=private_key,
+            )
+        elif (
+            self.default_public_key_path is not None
+            and self.default_public_key_path.is_file()
+        ):
+            public_key = load_pem_public_key(self.default_public_key_path.read_bytes())
+            keys[DEFAULT_KID] = SigningKey(
+                kid=DEFAULT_KID,
+                algorithm=self.algorithm_for(public_key),
+                public_key=public_key,
+            )
+
+        if self.keys_dir is not None and self.keys_dir.is_dir():
+            for path in sorted(self.keys_dir.glob("*.pem")):
+                data = path.read_bytes()
+                if path.name.endswith(".pub.pem"):
+                    kid = path.name.removesuffix(".pub.pem")
+                    public_key = load_pem_public_key(data)
+                    keys.setdefault(
+                        kid,
+                        SigningKey(
+                            kid=kid,
+                            algorithm=self.algorithm_for(public_key),
+                            public_key=public_key,
+                        ),
+                    )
+                    continue
+
+                kid = path.name.removesuffix(".pem")
+                private_key = load_pem_private_key(data, password=None)
+                keys[kid] = SigningKey(
+                    kid=kid,
+                    algorithm=self.algorithm_for(private_key),
+                    public_key=private_key.public_key(),
+                    private_key=private_key,
+                )
+                mtime = path.stat().st_mtime
+                if newest is None or (mtime, kid) > newest:
+                    newest = (mtime, kid)
+
+        if self.active_kid is not None:
+            signing_kid = self.active_kid
+        elif newest is not None:
+            # По умолчанию подписываем самым свежим ключом из каталога
+            signing_kid = newest[1]
+        else:
+            signing_kid = DEFAULT_KID
+
+        if signing_kid not in keys or keys[signing_kid].private_key is None:
+            raise ValueError(f"No private key for active kid {signing_kid!r}")
+
+        self._keys = keys
+        self._signing_kid = signing_kid
+        self._fingerprint = self._files_fingerprint(files)
+        self._checked_at = time.monotonic()
+        log.info("JWT keyring loaded: %s, signing with %r", sorted(keys), signing_kid)
+
+    @staticmethod
+    def _files_fingerprint(files: list[Path]) -> tuple:
+        return tuple((str(path), path.stat().st_mtime_ns) for path in files)
+
+    def maybe_reload(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if self._checked_at is None:
+            self.load()
+            return
+        # Даже принудительно проверяем файлы не чаще раза в секунду
+        interval = 1 if force else self.reload_interval
+        if now - self._checked_at < interval:
+            return
+
+        self._checked_at = now
+        if self._files_fingerprint(self._key_files()) != self._fingerprint:
+            try:
+                self.load()
+            except Exception:
+                # Битый файл ключа не должен ломать уже загруженные ключи
+                log.exception("JWT keyring reload failed, keeping previous keys")
+
+    def signing_key(self) -> SigningKey:
+        self.maybe_reload()
+        return self._keys[self._signing_kid]
+
+    def verification_key(self, kid: str | None) -> SigningKey | None:
+        self.maybe_reload()
+        key = self._keys.get(kid or DEFAULT_KID)
+        if key is None and kid is not None:
+            # Токен мог быть подписан ключом, который мы еще не видели
+            self.maybe_reload(force=True)
+            key = self._keys.get(kid)
+        return key
+
+
+keyring = KeyRing(
+    keys_dir=settings.auth_jwt.keys_dir,
+    active_kid=settings.auth_jwt.active_kid,
+    rsa_algorithm=settings.auth_jwt.algorithm,
+    reload_interval=settings.auth_jwt.keys_reload_interval_seconds,
+    default_private_key_path=settings.auth_jwt.private_key_path,
+    default_public_key_path=settings.auth_jwt.public_key_path,
+)
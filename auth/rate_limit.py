@@ -0,0 +1,103 @@
+import time
+from collections import OrderedDict
+
+from sqlalchemy import delete, func, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import settings, RateLimit
+from core.exceptions.auth import TooManyAttemptsException
+from core.models.db_helper import db_helper
+from core.models.rate_limits import rate_limits_table
+
+
+class MemoryRateLimitBackend:
+    """Token bucket в памяти процесса (лимит на каждый воркер отдельно)"""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        # key -> (tokens, updated_at)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        rate = limit.per_minute / 60
+        tokens, updated_at = self._buckets.get(key, (limit.burst, now))
+        tokens = min(limit.burst, tokens + (now - updated_at) * rate)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # Через сколько секунд накопится один токен
+            return (1 - tokens) / rate
+
+        self._buckets[key] = (tokens - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return 0
+
+
+class PostgresRateLimitBackend:
+    """Общий для всех воркеров token bucket: один UPSERT на проверку"""
+
+    def __init__(self, engine: AsyncEngine, purge_every: int = 1000) -> None:
+        self.engine = engine
+        self.purge_every = purge_every
+        self._hits = 0
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        rate = limit.per_minute / 60
+        bucket = rate_limits_table.c
+        refilled = func.least(
+            limit.burst,
+            bucket.tokens
+            + func.extract("epoch", func.now() - bucket.updated_at) * rate,
+        )
+        stmt = insert(rate_limits_table).values(
+            key=key,
+            tokens=limit.burst - 1,
+            updated_at=func.now(),
+        )
+        # Отказ тоже тратит токен, но не ниже -1: долбящий клиент так и остается заблокированным
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[bucket.key],
+            set_={
+                "tokens": func.greatest(refilled - 1, literal(-1.0)),
+                "updated_at": func.now(),
+            },
+        ).returning(bucket.tokens)
+
+        async with self.engine.begin() as connection:
+            tokens = (await connection.execute(stmt)).scalar_one()
+
+            self._hits += 1
+            if self._hits % self.purge_every == 0:
+                # Старые корзины давно полные - их можно просто удалить
+                await connection.execute(
+                    delete(rate_limits_table).where(
+                        bucket.updated_at < func.now() - func.make_interval(0, 0, 0, 1)
+                    )
+                )
+
+        if tokens < 0:
+            return -tokens / rate
+        return 0
+
+
+class RateLimiter:
+    def __init__(self, backend) -> None:
+        self.backend = backend
+
+    async def check(self, *limits: tuple[str, RateLimit]) -> None:
+        retry_after = 0.0
+        for key, limit in limits:
+            retry_after = max(retry_after, await self.backend.hit(key, limit))
+        if retry_after > 0:
+            raise TooManyAttemptsException(retry_after=max(1, round(retry_after)))
+
+
+if settings.rate_limit.backend == "postgres":
+    rate_limiter = RateLimiter(PostgresRateLimitBackend(db_helper.engine))
+else:
+    rate_limiter = RateLimiter(MemoryRateLimitBackend())
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from core.config import settings
+
+
+log = logging.getLogger(__name__)
+
+PARENT_TABLE = "refresh_tokens"
+PARTITION_RE = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+# Любое число, общее для всех воркеров: секциями управляет кто-то один
+ADVISORY_LOCK_ID = 0x7265_6672  # "refr"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year}m{month.month:02d}"
+
+
+class RefreshTokenPartitions:
+    """Управление месячными секциями refresh_tokens
+
+    Заранее создает секции на months_ahead месяцев вперед и удаляет
+    секции, все токены в которых уже истекли. DROP секции вместо
+    построчного DELETE не оставляет мертвых строк и раздутых индексов.
+    """
+
+    def __init__(self, months_ahead: int = 3, interval_seconds: float = 3600) -> None:
+        self.months_ahead = months_ahead
+        self.interval_seconds = interval_seconds
+
+    async def _existing(self, connection: AsyncConnection) -> list[str]:
+        result = await connection.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :parent"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        return list(result.scalars())
+
+    async def ensure_partitions(self, connection: AsyncConnection) -> list[str]:
+        created = []
+        existing = set(await self._existing(connection))
+        current = month_start(datetime.now(timezone.utc).date())
+
+        for offset in range(self.months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            await connection.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                    f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') "
+                    f"TO ('{add_months(month, 1).isoformat()} 00:00+00')"
+                )
+            )
+            created.append(name)
+        return created
+
+    async def drop_expired_partitions(self, connection: AsyncConnection) -> list[str]:
+        dropped = []
+        current = month_start(datetime.now(timezone.utc).date())
+
+        for name in await self._existing(connection):
+            match = PARTITION_RE.match(name)
+            if not match:
+                continue
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            # Верхняя граница секции уже в прошлом - живых токенов в ней нет
+            if add_months(month, 1) <= current:
+                await connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+        return dropped
+
+    async def maintain(self, engine: AsyncEngine) -> None:
+        async with engine.begin() as connection:
+            locked = await connection.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:id)"),
+                {"id": ADVISORY_LOCK_ID},
+            )
+            if not locked:
+                return
+
+            created = await self.ensure_partitions(connection)
+            dropped = await self.drop_expired_partitions(connection)
+            if created or dropped:
+                log.info(
+                    "refresh_tokens partitions created: %s, dropped: %s",
+                    created,
+                    dropped,
+                )
+
+    async def run(self, engine: AsyncEngine) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.maintain(engine)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("refresh_tokens partition maintenance failed")
+
+
+refresh_token_partitions = RefreshTokenPartitions(
+    # Секции должны покрывать весь срок жизни refresh токена
+    months_ahead=settings.auth_jwt.refresh_token_expire_days // 28 + 2,
+    interval_seconds=settings.auth_jwt.refresh_partitions_interval_seconds,
+)
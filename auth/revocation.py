@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Iterable
+
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from auth.user_cache import user_identity_cache
+from core.config import settings
+from core.models import RefreshToken, User
+
+
+log = logging.getLogger(__name__)
+
+# Ограничение Postgres на размер payload у NOTIFY - 8000 байт
+NOTIFY_BATCH_SIZE = 150
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationIndex:
+    """Индекс отозванных refresh токенов в памяти процесса
+
+    Bloom-фильтр отсекает почти все неотозванные jti, положительные
+    ответы подтверждаются точным словарем jti -> expires_at.
+    Отдельно хранится текущее поколение токенов пользователей,
+    у которых оно уже увеличивалось (logout со всех устройств).
+    Между воркерами индекс синхронизируется через LISTEN/NOTIFY.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+    ) -> None:
+        self.channel = channel
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Пока индекс не загружен и канал не слушается, доверять ему нельзя
+        self.ready = False
+        self._exact: dict[str, float] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        # user_id -> минимальное допустимое поколение токенов
+        self._generations: dict[int, int] = {}
+
+    def _rebuild(self) -> None:
+        now = time.time()
+        self._exact = {
+            jti: expires_at
+            for jti, expires_at in self._exact.items()
+            if expires_at > now
+        }
+        capacity = self.capacity
+        while capacity < len(self._exact) * 2:
+            capacity *= 2
+        self._bloom = BloomFilter(capacity, self.error_rate)
+        for jti in self._exact:
+            self._bloom.add(jti)
+
+    def add(self, jti: str, expires_at: float = math.inf) -> None:
+        if jti in self._exact:
+            return
+        self._exact[jti] = expires_at
+        self._bloom.add(jti)
+        if len(self._exact) > self._bloom.capacity:
+            self._rebuild()
+
+    def is_revoked(self, jti: str) -> bool | None:
+        # None - индекс не готов, проверять нужно по БД
+        if not self.ready:
+            return None
+        if jti not in self._bloom:
+            return False
+        return jti in self._exact
+
+    def set_generation(self, user_id: int, generation: int) -> None:
+        if generation > self._generations.get(user_id, 0):
+            self._generations[user_id] = generation
+            # Закэшированный пользователь мог остаться со старым поколением
+            user_identity_cache.invalidate(user_id)
+
+    def is_stale(self, user_id: int, generation: int) -> bool:
+        return generation < self._generations.get(user_id, 0)
+
+    async def load(self, session: AsyncSession) -> None:
+        # Частичный индекс ix_refresh_tokens_revoked: только отозванные при выходе.
+        # Замененные при ротации не грузим - повторное использование такого
+        # токена ловит сам запрос ротации, а publish для них не вызывается
+        stmt = select(RefreshToken.jti, RefreshToken.expires_at).where(
+            RefreshToken.revoke == True,
+            # Константа, а не параметр: иначе планировщик не сопоставит
+            # условие с частичным индексом
+            RefreshToken.revoke_reason.is_distinct_from(literal_column("'rotated'")),
+            RefreshToken.expires_at > func.now(),
+        )
+        result = await session.stream(stmt.execution_options(yield_per=10_000))
+        # Не затираем jti, пришедшие через NOTIFY во время загрузки
+        async for jti, expires_at in result:
+            self._exact[jti] = expires_at.timestamp() if expires_at else math.inf
+        self._rebuild()
+
+        result = await session.stream(
+            select(User.id, User.token_generation)
+            .where(User.token_generation > 0)
+            .execution_options(yield_per=10_000)
+        )
+        async for user_id, generation in result:
+            self.set_generation(user_id, generation)
+
+        log.info(
+            "Revocation index loaded: %d jti, %d user generations",
+            len(self._exact),
+            len(self._generations),
+        )
+
+    # NOTIFY уходит вместе с commit транзакции, которая отзывает токены
+    async def publish(
+        self,
+        session: AsyncSession,
+        tokens: list[RefreshToken],
+    ) -> None:
+        for start in range(0, len(tokens), NOTIFY_BATCH_SIZE):
+            batch = tokens[start : start + NOTIFY_BATCH_SIZE]
+            payload = ",".join(
+                f"{token.jti}:{token.expires_at.timestamp() if token.expires_at else ''}"
+                for token in batch
+            )
+            await session.execute(select(func.pg_notify(self.channel, payload)))
+
+        for token in tokens:
+            self.add(
+                token.jti,
+                token.expires_at.timestamp() if token.expires_at else math.inf,
+            )
+
+    async def publish_generation(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        generation: int,
+    ) -> None:
+        await session.execute(
+            select(func.pg_notify(self.channel, f"gen:{user_id}:{generation}"))
+        )
+        self.set_generation(user_id, generation)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        if payload.startswith("gen:"):
+            _, user_id, generation = payload.split(":")
+            self.set_generation(int(user_id), int(generation))
+            return
+
+        for item in payload.split(","):
+            jti, _, expires_at = item.partition(":")
+            self.add(jti, float(expires_at) if expires_at else math.inf)
+
+    async def run(
+        self,
+        engine: AsyncEngine,
+        reconnect_delay: float = 5,
+        prune_interval: float = 3600,
+    ) -> None:
+        while True:
+            try:
+                async with engine.connect() as connection:
+                    raw = await connection.get_raw_connection()
+                    driver = raw.driver_connection
+                    closed = asyncio.Event()
+                    driver.add_termination_listener(lambda _: closed.set())
+                    # Сначала слушаем канал, потом грузим снимок - так ничего не теряем
+                    await driver.add_listener(self.channel, self._on_notify)
+                    try:
+                        async with AsyncSession(engine) as session:
+                            await self.load(session)
+                        self.ready = True
+
+                        while not closed.is_set():
+                            try:
+                                await asyncio.wait_for(closed.wait(), prune_interval)
+                            except asyncio.TimeoutError:
+                                # Периодически выбрасываем истекшие jti
+                                self._rebuild()
+                    finally:
+                        # Соединение вернется в пул - снимаем LISTEN
+                        if not closed.is_set():
+                            await driver.remove_listener(self.channel, self._on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Revocation index listener failed, reconnecting")
+            finally:
+                self.ready = False
+            await asyncio.sleep(reconnect_delay)
+
+
+revocation_index = RevocationIndex(
+    channel=settings.auth_jwt.revocation_channel,
+    capacity=settings.auth_jwt.revocation_bloom_capacity,
+    error_rate=settings.auth_jwt.revocation_bloom_error_rate,
+)
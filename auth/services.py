@@ -1,11 +1,23 @@
+import logging
 import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 from datetime import timezone
 
-from sqlalchemy import Result
+from sqlalchemy import (
+    DateTime,
+    Result,
+    false,
+    func,
+    insert,
+    literal,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm.attributes import set_committed_value
 
 from core.config import settings
 from core.models import User, RefreshToken
@@ -17,6 +29,8 @@ from core.exceptions.auth import (
     TokenExpiredException,
     TokenTypeException,
     RefreshTokenRevokedException,
+    RefreshTokenReusedException,
+    PasswordHashingBusyException,
 )
 from core.exceptions.users import (
     UserNotFoundException,
@@ -24,10 +38,14 @@ from core.exceptions.users import (
     UserAlreadyExistsException,
 )
 
-from auth.hashing import hashing_password
+from auth.hashing import password_hashing_pool
 from auth.jwt_manager import jwt_manager
+from auth.revocation import revocation_index
+from auth.user_cache import user_identity_cache
+from auth.utils import token_expires_at
+
 
-from starlette.concurrency import run_in_threadpool
+log = logging.getLogger(__name__)
 
 
 class AuthService:
@@ -49,20 +67,49 @@ class AuthService:
             if not user.is_active:
                 raise UserNotActiveException()
 
-            is_valid = await run_in_threadpool(
-                hashing_password.validate_password, password, user.hashed_password
+            is_valid = await password_hashing_pool.validate_password(
+                password, user.hashed_password
             )
             if not is_valid:
                 raise InvalidCredentialsException()
 
+            # Хэш со старым cost прозрачно пересчитываем при входе
+            if password_hashing_pool.needs_rehash(user.hashed_password):
+                await AuthService._rehash_password(user, password, session)
+
             return user
 
-        except (InvalidCredentialsException, UserNotActiveException):
+        except (
+            InvalidCredentialsException,
+            UserNotActiveException,
+            PasswordHashingBusyException,
+        ):
             raise
         except Exception:
             # Логируем неожиданные ошибки
             raise InvalidCredentialsException()
 
+    @staticmethod
+    async def _rehash_password(
+        user: User,
+        password: str,
+        session: AsyncSession,
+    ) -> None:
+        user_id = user.id
+        old_hash = user.hashed_password
+        try:
+            user.hashed_password = await password_hashing_pool.hash_password(password)
+            await session.commit()
+            user_identity_cache.invalidate(user_id)
+        except Exception:
+            # Неудачный rehash не должен ломать вход: никаких запросов к базе.
+            # Отсоединяем пользователя до rollback, чтобы его атрибуты не истекли,
+            # и возвращаем старый хэш - он и лежит в базе
+            log.exception("Password rehash failed for user %d", user_id)
+            session.expunge(user)
+            await session.rollback()
+            set_committed_value(user, "hashed_password", old_hash)
+
     @staticmethod
     async def register_user(
         email: str,
@@ -71,25 +118,25 @@ class AuthService:
         session: AsyncSession,
     ) -> User:
         try:
-            stmt = select(User).where(
-                (User.username == username) | (User.email == email)
+            hashed_password = await password_hashing_pool.hash_password(password)
+            # Занятые username/email отсекает уникальный индекс, а не SELECT перед вставкой
+            user = await session.scalar(
+                pg_insert(User)
+                .values(
+                    email=email,
+                    username=username,
+                    hashed_password=hashed_password,
+                )
+                .on_conflict_do_nothing()
+                .returning(User)
             )
-            result: Result = await session.execute(stmt)
-            if result.scalar_one_or_none():
+            if user is None:
                 raise UserAlreadyExistsException()
 
-            hashed_password = await run_in_threadpool(
-                hashing_password.hash_password, password
-            )
-            user = User(email=email, username=username, hashed_password=hashed_password)
-
-            session.add(user)
             await session.commit()
-            await session.refresh(user)
-
             return user
 
-        except UserAlreadyExistsException:
+        except (UserAlreadyExistsException, PasswordHashingBusyException):
             await session.rollback()
             raise
         except Exception:
@@ -97,39 +144,72 @@ class AuthService:
             # Логируем ошибку
             raise UserAlreadyExistsException()
 
+    @staticmethod
+    def _new_refresh_expiry() -> datetime:
+        # exp в JWT хранится в секундах: expires_at должен совпадать с ним точно
+        return (
+            datetime.now(timezone.utc)
+            + timedelta(days=settings.auth_jwt.refresh_token_expire_days)
+        ).replace(microsecond=0)
+
+    @staticmethod
+    def _sign_tokens(
+        user_id: int,
+        username: str,
+        email: str,
+        generation: int,
+        refresh_jti: str,
+        refresh_expires_at: datetime,
+    ) -> TokenPair:
+        current_time = datetime.now(timezone.utc)
+
+        access_payload = {
+            "sub": str(user_id),
+            "username": username,
+            "email": email,
+            "jti": str(uuid.uuid4()),
+            "type": "access",
+            "iai": current_time.timestamp(),
+            "gen": generation,
+        }
+
+        refresh_payload = {
+            "sub": str(user_id),
+            "jti": refresh_jti,
+            "type": "refresh",
+            "iai": current_time.timestamp(),
+            "gen": generation,
+        }
+
+        return TokenPair(
+            access_token=jwt_manager.create_access_token(access_payload),
+            refresh_token=jwt_manager.create_refresh_token(
+                refresh_payload, expire_at=refresh_expires_at
+            ),
+            token_type="Bearer",
+        )
+
     @staticmethod
     async def create_tokens(
         user: User,
         session: AsyncSession,
     ) -> TokenPair:
         try:
-            current_time = datetime.now(timezone.utc)
-            expires_at = current_time + timedelta(
-                days=settings.auth_jwt.refresh_token_expire_days
-            )
+            refresh_jti = str(uuid.uuid4())
+            expires_at = AuthService._new_refresh_expiry()
 
-            access_payload = {
-                "sub": str(user.id),
-                "username": user.username,
-                "email": user.email,
-                "jti": str(uuid.uuid4()),
-                "type": "access",
-                "iai": current_time.timestamp(),
-            }
-
-            refresh_payload = {
-                "sub": str(user.id),
-                "jti": str(uuid.uuid4()),
-                "type": "refresh",
-                "iai": current_time.timestamp(),
-            }
-
-            access_token = jwt_manager.create_access_token(access_payload)
-            refresh_token = jwt_manager.create_refresh_token(refresh_payload)
+            token_pair = AuthService._sign_tokens(
+                user_id=user.id,
+                username=user.username,
+                email=user.email,
+                generation=user.token_generation,
+                refresh_jti=refresh_jti,
+                refresh_expires_at=expires_at,
+            )
 
             # Сохраняем refresh token в базу данных
             refresh_token_record = RefreshToken(
-                jti=refresh_payload["jti"],
+                jti=refresh_jti,
                 user_id=user.id,
                 expires_at=expires_at,
             )
@@ -137,17 +217,84 @@ class AuthService:
             session.add(refresh_token_record)
             await session.commit()
 
-            return TokenPair(
-                access_token=access_token,
-                refresh_token=refresh_token,
-                token_type="Bearer",
-            )
+            return token_pair
 
         except Exception:
             await session.rollback()
             # Логируем ошибку создания токенов
             raise TokenInvalidException()
 
+    @staticmethod
+    def _rotation_statement(
+        jti: str,
+        expires_at: datetime,
+        generation: int,
+        new_jti: str,
+        new_expires_at: datetime,
+    ):
+        """Ротация refresh токена одним запросом
+
+        prior - был ли старый токен в базе вообще и когда его отозвали,
+        old - отзываем его, только если он еще не был отозван,
+        usr - владелец токена,
+        ins - новый токен, только для активного пользователя текущего поколения.
+        Токен найден, но не отозван этим запросом - значит, его уже использовали.
+        """
+        match = (RefreshToken.jti == jti) & (RefreshToken.expires_at == expires_at)
+
+        prior = select(RefreshToken.revoked_at).where(match).cte("prior")
+        old = (
+            update(RefreshToken)
+            .where(match & (RefreshToken.revoke == False))
+            .values(revoke=True, revoked_at=func.now(), revoke_reason="rotated")
+            .returning(RefreshToken.user_id)
+            .cte("old")
+        )
+        usr = (
+            select(
+                User.id,
+                User.username,
+                User.email,
+                User.is_active,
+                User.token_generation,
+            )
+            .join(old, User.id == old.c.user_id)
+            .cte("usr")
+        )
+        ins = (
+            insert(RefreshToken)
+            .from_select(
+                ["jti", "revoke", "user_id", "expires_at"],
+                select(
+                    literal(new_jti),
+                    false(),
+                    usr.c.id,
+                    literal(new_expires_at, DateTime(timezone=True)),
+                ).where(usr.c.is_active & (usr.c.token_generation == generation)),
+            )
+            .returning(RefreshToken.user_id)
+            .cte("ins")
+        )
+
+        one = select(literal(1).label("one")).subquery("one")
+        return (
+            select(
+                usr.c.id,
+                usr.c.username,
+                usr.c.email,
+                usr.c.is_active,
+                usr.c.token_generation,
+                select(func.count())
+                .select_from(prior)
+                .scalar_subquery()
+                .label("found"),
+                select(prior.c.revoked_at).scalar_subquery().label("revoked_at"),
+                select(func.count()).select_from(ins).scalar_subquery().label("issued"),
+            )
+            .select_from(one)
+            .outerjoin(usr, true())
+        )
+
     @staticmethod
     async def refresh_token(
         refresh_token: str,
@@ -161,24 +308,86 @@ class AuthService:
                 raise TokenTypeException("Expected refresh token")
 
             jti = payload.get("jti")
-            if jti:
-                stmt = select(RefreshToken).where(
-                    (RefreshToken.jti == jti) & (RefreshToken.revoke == True)
+            user_id = int(payload["sub"])
+            generation = payload.get("gen", 0)
+            if not jti:
+                raise TokenInvalidException()
+
+            # Заведомо отозванные токены отсекаем без похода в БД
+            if revocation_index.is_revoked(jti) or revocation_index.is_stale(
+                user_id, generation
+            ):
+                raise RefreshTokenRevokedException()
+
+            new_jti = str(uuid.uuid4())
+            new_expires_at = AuthService._new_refresh_expiry()
+            expires_at = token_expires_at(payload)
+
+            def rotate(expires_at: datetime):
+                return AuthService._rotation_statement(
+                    jti=jti,
+                    expires_at=expires_at,
+                    generation=generation,
+                    new_jti=new_jti,
+                    new_expires_at=new_expires_at,
+                )
+
+            row = (await session.execute(rotate(expires_at))).one()
+
+            if not row.found:
+                await session.rollback()
+                # Токены, выданные до секционирования: expires_at в базе считался
+                # от другого now(), чем exp. Ищем по одному jti во всех секциях
+                stored_expires_at = await session.scalar(
+                    select(RefreshToken.expires_at).where(RefreshToken.jti == jti)
                 )
-                result: Result = await session.execute(stmt)
-                if result.scalar_one_or_none():
+                if stored_expires_at is None or stored_expires_at == expires_at:
+                    await session.rollback()
+                    raise TokenInvalidException()
+                expires_at = stored_expires_at
+                row = (await session.execute(rotate(expires_at))).one()
+                if not row.found:
+                    await session.rollback()
+                    raise TokenInvalidException()
+            if row.id is None:
+                await session.rollback()
+                # Снимок CTE сделан до того, как мы дождались блокировки строки:
+                # если токен отозвал параллельный refresh, revoked_at там NULL.
+                # Перечитываем отдельным запросом уже после его коммита
+                revoked_at = await session.scalar(
+                    select(RefreshToken.revoked_at).where(
+                        (RefreshToken.jti == jti)
+                        & (RefreshToken.expires_at == expires_at)
+                    )
+                )
+                await session.rollback()
+                # Параллельный refresh из соседней вкладки - не атака
+                grace = timedelta(seconds=settings.auth_jwt.refresh_reuse_grace_seconds)
+                if (
+                    revoked_at is None
+                    or revoked_at > datetime.now(timezone.utc) - grace
+                ):
                     raise RefreshTokenRevokedException()
+                # Токен уже был использован давно: его, скорее всего, украли.
+                # Отзываем все сессии пользователя
+                await AuthService._bump_token_generation(user_id, session)
+                raise RefreshTokenReusedException()
 
-            # Получаем пользователя
-            user_id = int(payload["sub"])
-            user = await session.get(User, user_id)
+            await session.commit()
 
-            if not user:
-                raise UserNotFoundException()
-            if not user.is_active:
+            if not row.is_active:
                 raise UserNotActiveException()
-
-            return await AuthService.create_tokens(user, session)
+            if not row.issued:
+                raise RefreshTokenRevokedException()
+
+            return AuthService._sign_tokens(
+                user_id=row.id,
+                username=row.username,
+                email=row.email,
+                generation=row.token_generation,
+                refresh_jti=new_jti,
+                refresh_expires_at=new_expires_at,
+            )
 
         except (
             TokenExpiredException,
@@ -190,6 +399,7 @@ class AuthService:
         ):
             raise
         except Exception:
+            await session.rollback()
             # Логируем неожиданные ошибки
             raise TokenInvalidException()
 
@@ -207,14 +417,28 @@ class AuthService:
                 if jti:
                     # Находим запись refresh токена в базе
                     stmt = select(RefreshToken).where(
-                        (RefreshToken.jti == jti) & (RefreshToken.user_id == user.id)
+                        (RefreshToken.jti == jti)
+                        & (RefreshToken.expires_at == token_expires_at(payload))
+                        & (RefreshToken.user_id == user.id)
                     )
                     result: Result = await session.execute(stmt)
                     refresh_token_record = result.scalar_one_or_none()
+                    if refresh_token_record is None:
+                        # Токены, выданные до секционирования: expires_at мог
+                        # разойтись с exp, ищем по jti во всех секциях
+                        refresh_token_record = await session.scalar(
+                            select(RefreshToken).where(
+                                (RefreshToken.jti == jti)
+                                & (RefreshToken.user_id == user.id)
+                            )
+                        )
 
                     if refresh_token_record:
-                        # Помечаем как отозванный
+                        # Помечаем как отозванный и оповещаем остальные воркеры
                         refresh_token_record.revoke = True
+                        refresh_token_record.revoked_at = func.now()
+                        refresh_token_record.revoke_reason = "logout"
+                        await revocation_index.publish(session, [refresh_token_record])
                         await session.commit()
 
             return {"message": "Logged out successfully"}
@@ -223,22 +447,31 @@ class AuthService:
             # Если токен невалидный, все равно считаем логаут успешным. Логируем ошибку
             return {"message": "Logged out successfully"}
 
+    @staticmethod
+    async def _bump_token_generation(
+        user_id: int,
+        session: AsyncSession,
+    ) -> int:
+        # Один UPDATE по первичному ключу вместо обхода всех сессий
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(token_generation=User.token_generation + 1)
+            .returning(User.token_generation)
+        )
+        generation = (await session.execute(stmt)).scalar_one()
+
+        await revocation_index.publish_generation(session, user_id, generation)
+        await session.commit()
+        return generation
+
     @staticmethod
     async def logout_all_devices(
         user: User,
         session: AsyncSession,
     ) -> dict:
         try:
-            stmt = select(RefreshToken).where(
-                (RefreshToken.user_id == user.id) & (RefreshToken.revoke == False)
-            )
-            result: Result = await session.execute(stmt)
-            active_tokens = result.scalars().all()
-
-            for token in active_tokens:
-                token.revoke = True
-
-            await session.commit()
+            await AuthService._bump_token_generation(user.id, session)
 
             return {"message": "Logged out from all devices successfully"}
 
@@ -0,0 +1,49 @@
+import asyncio
+import logging
+from typing import Callable
+
+from auth.hashing import password_hashing_pool
+from auth.token_cache import verified_token_cache
+from core.config import settings
+
+
+log = logging.getLogger(__name__)
+
+
+class StatsReporter:
+    """Периодический лог метрик пулов и кэшей процесса
+
+    Счетчики накопительные с момента старта: для графиков берется
+    разница между соседними строками лога.
+    """
+
+    def __init__(
+        self,
+        sources: dict[str, Callable[[], dict]],
+        interval_seconds: float = 60,
+    ) -> None:
+        self.sources = sources
+        self.interval_seconds = interval_seconds
+
+    def report(self) -> None:
+        for name, stats in self.sources.items():
+            log.info("%s stats: %s", name, stats())
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                self.report()
+            except Exception:
+                log.exception("Stats report failed")
+
+
+stats_reporter = StatsReporter(
+    sources={
+        # Очередь и задержки bcrypt: рост queue_depth - пора добавить воркеров
+        "password_hashing": password_hashing_pool.stats,
+        # Доля JWT, проверенных без повторной проверки подписи
+        "token_cache": verified_token_cache.stats,
+    },
+    interval_seconds=settings.stats.log_interval_seconds,
+)
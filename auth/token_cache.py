@@ -0,0 +1,79 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from core.config import settings
+
+
+class VerifiedTokenCache:
+    """LRU-кэш уже проверенных payload'ов access токенов"""
+
+    def __init__(self, max_size: int = 10_000) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # digest токена -> (exp, payload)
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+    # Храним не сам токен, а его дайджест
+    @staticmethod
+    def _digest(token: str | bytes) -> bytes:
+        if isinstance(token, str):
+            token = token.encode()
+        return hashlib.sha256(token).digest()
+
+    def get(self, token: str | bytes) -> dict | None:
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, payload = entry
+        # Запись живет не дольше, чем сам токен
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def set(self, token: str | bytes, payload: dict) -> None:
+        exp = payload.get("exp")
+        if exp is None or self.max_size <= 0:
+            return
+
+        key = self._digest(token)
+        self._entries[key] = (float(exp), payload)
+        self._entries.move_to_end(key)
+        # Вытесняем самые давно использованные записи
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, token: str | bytes) -> None:
+        self._entries.pop(self._digest(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (
+                self.hits / (self.hits + self.misses)
+                if self.hits + self.misses
+                else 0.0
+            ),
+        }
+
+
+verified_token_cache = VerifiedTokenCache(
+    max_size=settings.auth_jwt.token_cache_max_size,
+)
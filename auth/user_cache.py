@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from core.config import settings
+from core.models import User
+
+
+class UserIdentityCache:
+    """Короткоживущий кэш пользователей по id"""
+
+    def __init__(self, ttl_seconds: float = 30, max_size: int = 10_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # user_id -> (expires_at, значения колонок)
+        self._entries: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+
+    # Храним снимок колонок, а не ORM объект: он не привязан к сессии
+    @staticmethod
+    def _snapshot(user: User) -> dict:
+        return {
+            attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+        }
+
+    def get(self, user_id: int, session: AsyncSession) -> User | None:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+
+        # Восстанавливаем пользователя в сессии запроса без запроса к БД
+        user = User(**entry[1])
+        make_transient_to_detached(user)
+        session.add(user)
+        return user
+
+    def set(self, user: User) -> None:
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        self._entries[user.id] = (expires_at, self._snapshot(user))
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+user_identity_cache = UserIdentityCache(
+    ttl_seconds=settings.auth_jwt.user_cache_ttl_seconds,
+    max_size=settings.auth_jwt.user_cache_max_size,
+)
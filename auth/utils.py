@@ -31,3 +31,8 @@ def set_jwt_cookie(
         samesite="lax",
         max_age=refresh_max_age,
     )
+
+
+# Момент истечения токена по его claim exp (ключ секции refresh_tokens)
+def token_expires_at(payload: dict) -> datetime:
+    return datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
@@ -1,5 +1,6 @@
 from pathlib import Path
-from pydantic import BaseModel, PostgresDsn
+from typing import Literal
+from pydantic import BaseModel, Field, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,14 +13,109 @@ class DatabaseSettings(BaseModel):
     echo_pool: bool = False
     pool_size: int = 50
     max_overflow: int = 10
+    # Реплики только для чтения; пустой список - все идет в мастер
+    replicas: list[PostgresDsn] = []
+    replica_max_lag_seconds: float = 5  # seconds
+    replica_check_interval_seconds: float = 5  # seconds
 
 
 class AuthJWT(BaseModel):
     private_key_path: Path = BASE_DIR / "certs" / "jwt-private.pem"
     public_key_path: Path = BASE_DIR / "certs" / "jwt-public.pem"
-    algorithm: str = "RS256"
+    # Каталог ротируемых ключей: <kid>.pem и <kid>.pub.pem
+    keys_dir: Path = BASE_DIR / "certs" / "keys"
+    active_kid: str | None = None
+    keys_reload_interval_seconds: float = 30  # seconds
+    algorithm: str = "RS256"  # для RSA ключей
     access_token_expire_minutes: int = 15  # minutes
     refresh_token_expire_days: int = 30  # days
+    token_cache_max_size: int = 10_000  # verified access tokens
+    user_cache_ttl_seconds: float = 30  # seconds
+    user_cache_max_size: int = 10_000  # users
+    # Индекс отозванных refresh токенов и канал NOTIFY для его синхронизации
+    revocation_channel: str = "refresh_token_revoked"
+    revocation_bloom_capacity: int = 100_000
+    revocation_bloom_error_rate: float = 0.001
+    # Как часто создавать/удалять месячные секции refresh_tokens
+    refresh_partitions_interval_seconds: float = 3600  # seconds
+    # Повторный refresh тем же токеном в этом окне - гонка вкладок, а не кража
+    refresh_reuse_grace_seconds: float = 30  # seconds
+
+
+class PasswordHashing(BaseModel):
+    # thread - пул потоков, process - пул процессов (в обход GIL)
+    executor: Literal["thread", "process"] = "thread"
+    workers: int = 4
+    # Сколько операций может ждать в очереди, прежде чем отвечать 503
+    max_pending: int = 64
+    retry_after_seconds: int = 1
+    # Cost bcrypt подбирается при старте под целевую задержку на этой машине
+    target_ms: float = 250
+    # Ниже 12 не опускаемся даже на медленном железе
+    min_rounds: int = Field(12, ge=12)
+    max_rounds: int = 16
+    # Явно заданный cost отключает калибровку
+    rounds: int | None = Field(None, ge=12)
+
+
+class RateLimit(BaseModel):
+    # Сколько попыток подряд и сколько восстанавливается в минуту
+    burst: int
+    per_minute: float
+
+
+class RateLimitSettings(BaseModel):
+    # memory - отдельно в каждом воркере, postgres - общий для всех
+    backend: Literal["memory", "postgres"] = "memory"
+    login_ip: RateLimit = RateLimit(burst=20, per_minute=10)
+    login_username: RateLimit = RateLimit(burst=10, per_minute=2)
+    register_ip: RateLimit = RateLimit(burst=5, per_minute=1)
+
+
+class Pagination(BaseModel):
+    default_page_size: int = 20
+    max_page_size: int = 100
+
+
+class Batch(BaseModel):
+    # Сколько элементов можно передать в одном batch запросе
+    max_size: int = 500
+
+
+class CommentCounters(BaseModel):
+    # Сверка comment_count с фактическим числом комментариев
+    repair_interval_seconds: float = 86400  # seconds
+    repair_batch_size: int = 1000  # parent rows per transaction
+
+
+class AccountDeletion(BaseModel):
+    # Строк, удаляемых одной транзакцией
+    chunk_size: int = 1000
+    poll_interval_seconds: float = 30  # seconds
+    # Задача без прогресса дольше аренды снова доступна другим воркерам
+    lease_seconds: float = 300  # seconds
+    max_attempts: int = 5
+
+
+class Export(BaseModel):
+    # Строк на одну выборку серверного курсора и один кусок ответа
+    batch_size: int = 1000
+    gzip_level: int = 6
+
+
+class BulkImport(BaseModel):
+    # Строк на одну проверку и один COPY
+    batch_size: int = 5000
+    # Сколько ошибок по строкам сохраняется на один импорт
+    max_errors: int = 1000
+    # Импорт без прогресса дольше аренды считается прерванным (упал воркер)
+    lease_seconds: float = 900  # seconds
+    sweep_interval_seconds: float = 300  # seconds
+
+
+class Stats(BaseModel):
+    # Как часто метрики внутренних пулов и кэшей пишутся в лог
+    log_interval_seconds: float = 60  # seconds
 
 
 class ApiPrefix(BaseModel):
@@ -28,6 +124,9 @@ class ApiPrefix(BaseModel):
     notes: str = "/notes"
     notifications: str = "/notifications"
     comments: str = "/comments"
+    search: str = "/search"
+    export: str = "/export"
+    imports: str = "/imports"
     jwt: str = "/jwt"
 
 
@@ -42,6 +141,15 @@ class Settings(BaseSettings):
     db: DatabaseSettings
     # Authenticate
     auth_jwt: AuthJWT = AuthJWT()
+    hashing: PasswordHashing = PasswordHashing()
+    rate_limit: RateLimitSettings = RateLimitSettings()
+    pagination: Pagination = Pagination()
+    batch: Batch = Batch()
+    comment_counters: CommentCounters = CommentCounters()
+    account_deletion: AccountDeletion = AccountDeletion()
+    export: Export = Export()
+    bulk_import: BulkImport = BulkImport()
+    stats: Stats = Stats()
     # Prefix
     prefix: ApiPrefix = ApiPrefix()
 
@@ -0,0 +1,29 @@
+from typing import Annotated
+
+from fastapi import Request, Form
+
+from auth.rate_limit import rate_limiter
+from core.config import settings
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+# Лимиты проверяются до поиска пользователя в БД и до bcrypt
+async def login_rate_limit(
+    request: Request,
+    username: Annotated[str, Form()],
+) -> None:
+    await rate_limiter.check(
+        (f"login:ip:{client_ip(request)}", settings.rate_limit.login_ip),
+        (f"login:user:{username.lower()}", settings.rate_limit.login_username),
+    )
+
+
+async def register_rate_limit(
+    request: Request,
+) -> None:
+    await rate_limiter.check(
+        (f"register:ip:{client_ip(request)}", settings.rate_limit.register_ip),
+    )
@@ -0,0 +1,7 @@
+from core.models import Comment
+from core.schemas.comments import CommentResponse
+from core.services.loading import ResponseShape
+
+
+def comment_shape() -> ResponseShape:
+    return ResponseShape(Comment, CommentResponse, relations={})
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import Query
+
+from core.models import Note
+from core.schemas.comments import CommentResponse
+from core.schemas.notes import NoteFilters, NoteResponse, NoteSort
+from core.services.loading import ResponseShape
+
+
+def note_filters(
+    is_important: bool | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    updated_after: datetime | None = None,
+    updated_before: datetime | None = None,
+    sort: NoteSort = "-created_at",
+) -> NoteFilters:
+    return NoteFilters(
+        is_important=is_important,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        sort=sort,
+    )
+
+
+def note_shape(
+    fields: Annotated[
+        str | None, Query(description="Поля через запятую, например id,title")
+    ] = None,
+    include: Annotated[str | None, Query(description="Связи: comments")] = None,
+) -> ResponseShape:
+    return ResponseShape(
+        Note,
+        NoteResponse,
+        relations={"comments": (Note.comments, CommentResponse)},
+        fields=fields,
+        include=include,
+    )
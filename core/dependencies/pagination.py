@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import Annotated
+
+from fastapi import Query
+
+from core.config import settings
+
+
+@dataclass
+class PageParams:
+    cursor: Annotated[
+        str | None, Query(description="next_cursor предыдущей страницы")
+    ] = None
+    limit: Annotated[int, Query(ge=1, le=settings.pagination.max_page_size)] = (
+        settings.pagination.default_page_size
+    )
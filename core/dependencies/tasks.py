@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import Query
+
+from core.models import Task
+from core.schemas.comments import CommentResponse
+from core.schemas.tasks import TaskFilters, TaskResponse, TaskSort
+from core.services.loading import ResponseShape
+
+
+def task_filters(
+    is_completed: bool | None = None,
+    title_prefix: Annotated[str | None, Query(min_length=1, max_length=255)] = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    updated_after: datetime | None = None,
+    updated_before: datetime | None = None,
+    sort: TaskSort = "-created_at",
+) -> TaskFilters:
+    return TaskFilters(
+        is_completed=is_completed,
+        title_prefix=title_prefix,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        sort=sort,
+    )
+
+
+def task_shape(
+    fields: Annotated[
+        str | None, Query(description="Поля через запятую, например id,title")
+    ] = None,
+    include: Annotated[str | None, Query(description="Связи: comments")] = None,
+) -> ResponseShape:
+    return ResponseShape(
+        Task,
+        TaskResponse,
+        relations={"comments": (Task.comments, CommentResponse)},
+        fields=fields,
+        include=include,
+    )
@@ -4,6 +4,9 @@ from fastapi.params import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.jwt_manager import jwt_manager
+from auth.revocation import revocation_index
+from auth.token_cache import verified_token_cache
+from auth.user_cache import user_identity_cache
 from core.models import User
 from core.models.db_helper import db_helper
 from core.exceptions.auth import (
@@ -12,6 +15,7 @@ from core.exceptions.auth import (
     TokenTypeException,
 )
 from core.exceptions.users import UserNotFoundException
+from core.schemas.users import UserClaims
 
 
 async def get_current_user_from_cookie(
@@ -22,7 +26,11 @@ async def get_current_user_from_cookie(
         raise TokenInvalidException("Missing access token")
 
     try:
-        payload = jwt_manager.verify_access_token(token)
+        # Подпись проверяем только если токена еще нет в кэше
+        payload = verified_token_cache.get(token)
+        if payload is None:
+            payload = jwt_manager.verify_access_token(token)
+            verified_token_cache.set(token, payload)
 
         if payload.get("type") != "access":
             raise TokenTypeException("Not an access token")
@@ -30,6 +38,10 @@ async def get_current_user_from_cookie(
         if "sub" not in payload:
             raise TokenInvalidException("Missing 'sub' in token")
 
+        # После logout со всех устройств старое поколение токенов недействительно
+        if revocation_index.is_stale(int(payload["sub"]), payload.get("gen", 0)):
+            raise TokenInvalidException("Token has been revoked")
+
         return payload
 
     except TokenExpiredException:
@@ -48,9 +60,15 @@ async def get_current_user(
         payload = await get_current_user_from_cookie(request)
         user_id = int(payload["sub"])
 
-        user: User | None = await session.get(User, user_id)
-        if not user:
-            raise UserNotFoundException()
+        user = user_identity_cache.get(user_id, session)
+        if user is None:
+            user = await session.get(User, user_id)
+            if not user:
+                raise UserNotFoundException()
+            user_identity_cache.set(user)
+
+        if payload.get("gen", 0) < user.token_generation:
+            raise TokenInvalidException("Token has been revoked")
 
         return user
     except (
@@ -62,3 +80,25 @@ async def get_current_user(
         raise
     except Exception:
         raise TokenInvalidException()
+
+
+# Для роутов, которым достаточно id/username/email: без сессии и без БД
+async def get_current_user_claims(
+    request: Request,
+) -> UserClaims:
+    try:
+        payload = await get_current_user_from_cookie(request)
+
+        return UserClaims(
+            id=int(payload["sub"]),
+            username=payload["username"],
+            email=payload["email"],
+        )
+    except (
+        TokenInvalidException,
+        TokenExpiredException,
+        TokenTypeException,
+    ):
+        raise
+    except Exception:
+        raise TokenInvalidException()
@@ -4,10 +4,16 @@ from fastapi import HTTPException, status
 class BaseAPIException(HTTPException):
     """Базовое исключение API"""
 
-    def __init__(self, status_code: int, detail: str):
+    def __init__(
+        self,
+        status_code: int,
+        detail: str,
+        headers: dict[str, str] | None = None,
+    ):
         super().__init__(
             status_code=status_code,
             detail=detail,
+            headers=headers,
         )
 
 
@@ -51,6 +57,36 @@ class ConflictException(BaseAPIException):
         )
 
 
+class ServiceUnavailableException(BaseAPIException):
+    """Исключение когда сервис временно перегружен"""
+
+    def __init__(
+        self,
+        detail: str = "Service temporarily unavailable",
+        retry_after: int = 1,
+    ):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class TooManyRequestsException(BaseAPIException):
+    """Исключение при превышении лимита запросов"""
+
+    def __init__(
+        self,
+        detail: str = "Too many requests",
+        retry_after: int = 1,
+    ):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 # Перебросил все импорты кастомных исключений для более удобного использования
 from .tasks import TaskNotFoundException, TaskAccessDeniedException
 from .users import (
@@ -67,5 +103,8 @@ from .auth import (
     TokenExpiredException,
     TokenInvalidException,
     RefreshTokenRevokedException,
+    RefreshTokenReusedException,
     InsufficientPermissionsException,
+    PasswordHashingBusyException,
+    TooManyAttemptsException,
 )
@@ -1,4 +1,9 @@
-from . import ValidationException, AccessDeniedException
+from . import (
+    ValidationException,
+    AccessDeniedException,
+    ServiceUnavailableException,
+    TooManyRequestsException,
+)
 
 
 class InvalidCredentialsException(ValidationException):
@@ -27,5 +32,26 @@ class InsufficientPermissionsException(AccessDeniedException):
 
 
 class RefreshTokenRevokedException(AccessDeniedException):
+    def __init__(self, detail: str = "Refresh token has been revoked"):
+        super().__init__(detail=detail)
+
+
+class RefreshTokenReusedException(RefreshTokenRevokedException):
     def __init__(self):
-        super().__init__(detail="Refresh token has been revoked")
+        super().__init__(detail="Refresh token reuse detected, all sessions revoked")
+
+
+class PasswordHashingBusyException(ServiceUnavailableException):
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            detail="Too many authentication requests, try again later",
+            retry_after=retry_after,
+        )
+
+
+class TooManyAttemptsException(TooManyRequestsException):
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            detail="Too many attempts, try again later",
+            retry_after=retry_after,
+        )
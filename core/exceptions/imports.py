@@ -0,0 +1,8 @@
+from core.exceptions import NotFoundException
+
+
+class ImportJobNotFoundException(NotFoundException):
+    """Исключение если импорт не найден"""
+
+    def __init__(self):
+        super().__init__(detail="Import job not found")
@@ -16,6 +16,11 @@ class UserAlreadyExistsException(ConflictException):
         super().__init__(detail="User already exists")
 
 
+class AccountDeletionNotFoundException(NotFoundException):
+    def __init__(self):
+        super().__init__(detail="Account deletion not found")
+
+
 class UserNotActiveException(AccessDeniedException):
     def __init__(self):
         super().__init__(detail="User account is not active")
@@ -6,6 +6,15 @@ from .notes import Note
 
 # from .notifications import Notification
 from .comments import Comment
+from .rate_limits import rate_limits_table
+from .account_deletions import AccountDeletion
+from .change_versions import user_change_versions_table
+from .imports import (
+    ImportJob,
+    ImportJobError,
+    import_staging_tasks_table,
+    import_staging_notes_table,
+)
 
 # Потом __all__
 __all__ = (
@@ -15,4 +24,7 @@ __all__ = (
     "Note",
     # "Notification" Реализуется чуть позже
     "Comment",
+    "AccountDeletion",
+    "ImportJob",
+    "ImportJobError",
 )
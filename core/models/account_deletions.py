@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from sqlalchemy import String, Text, DateTime, Integer, BigInteger, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from core.models.base import Base
+
+
+# Статусы, при которых задача удаления еще не завершена
+ACTIVE_DELETION_STATUSES = ("pending", "running")
+
+
+class AccountDeletion(Base):
+    """Фоновое удаление аккаунта пользователя порциями"""
+
+    __tablename__ = "account_deletions"
+    __table_args__ = (
+        # Одна незавершенная задача на пользователя
+        Index(
+            "ix_account_deletions_user_id_active",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+        # Очередь воркера: самые старые незавершенные задачи
+        Index(
+            "ix_account_deletions_queue",
+            "created_at",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    # Публичный идентификатор для проверки статуса без авторизации
+    token: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    # Без внешнего ключа: строка users удаляется в конце задачи
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(16), default="pending", server_default="pending", nullable=False
+    )
+    deleted_rows: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Таймстемпы
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    # Обновляется на каждой порции: по нему истекает аренда упавшего воркера
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
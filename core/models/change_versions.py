@@ -0,0 +1,14 @@
+from sqlalchemy import Table, Column, Integer, String, BigInteger
+
+from core.models.base import Base
+
+
+# Счетчик изменений задач и заметок пользователя для ETag списков.
+# Увеличивается триггерами на tasks и notes, один раз за оператор
+user_change_versions_table = Table(
+    "user_change_versions",
+    Base.metadata,
+    Column("user_id", Integer, primary_key=True),
+    Column("kind", String(16), primary_key=True),
+    Column("version", BigInteger, nullable=False, server_default="0"),
+)
@@ -1,11 +1,12 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, Text, DateTime, Boolean, ForeignKey, Integer
+from sqlalchemy import String, Text, DateTime, Boolean, ForeignKey, Integer, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from core.models.base import Base
+from core.models.search import search_vector
 
 
 if TYPE_CHECKING:
@@ -16,6 +17,24 @@ if TYPE_CHECKING:
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+        # Комментарий относится либо к задаче, либо к заметке
+        Index(
+            "ix_comments_task_id_created_at",
+            "task_id",
+            "created_at",
+            "id",
+            postgresql_where=text("task_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_comments_note_id_created_at",
+            "note_id",
+            "created_at",
+            "id",
+            postgresql_where=text("note_id IS NOT NULL"),
+        ),
+    )
 
     content: Mapped[str] = mapped_column(Text, nullable=False)
     # Таймстемпы
@@ -23,11 +42,15 @@ class Comment(Base):
         DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.clock_timestamp(),
     )
+    # Полнотекстовый поиск
+    search_vector: Mapped[str] = search_vector(("content", "A"))
     # Связи
     user_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
     task_id: Mapped[int | None] = mapped_column(
         ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True
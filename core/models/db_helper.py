@@ -1,6 +1,9 @@
+import asyncio
+import itertools
 import logging
 from typing import AsyncGenerator
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncEngine,
@@ -13,6 +16,36 @@ from core.config import settings
 
 log = logging.getLogger(__name__)
 
+# Отставание реплики в секундах. Если все полученное WAL уже применено,
+# реплика догнала мастер, даже если последняя транзакция была давно.
+# Но только пока WAL receiver подключен: без него receive_lsn замирает
+# и реплика "догоняет" сама себя. Такая реплика считается бесконечно
+# отстающей. Статус виден только роли с pg_read_all_stats (pg_monitor),
+# без нее все реплики исключаются и чтение идет с мастера
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT EXISTS ("
+    "SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') "
+    "THEN 'Infinity'::float8 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE("
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.session_factory = async_sessionmaker(
+            bind=engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+        )
+        # Пока отставание не измерено, на реплику не идем
+        self.lag: float | None = None
+
 
 class DatabaseHelper:
     def __init__(
@@ -22,6 +55,9 @@ class DatabaseHelper:
         echo_pool: bool = False,
         pool_size: int = 5,
         max_overflow: int = 10,
+        replica_urls: list[str] | None = None,
+        replica_max_lag_seconds: float = 5,
+        replica_check_interval_seconds: float = 5,
     ) -> None:
         self.engine: AsyncEngine = create_async_engine(
             url=url,
@@ -36,15 +72,75 @@ class DatabaseHelper:
             autocommit=False,
             expire_on_commit=False,
         )
+        self.replicas = [
+            Replica(
+                create_async_engine(
+                    url=replica_url,
+                    echo=echo,
+                    echo_pool=echo_pool,
+                    pool_size=pool_size,
+                    max_overflow=max_overflow,
+                )
+            )
+            for replica_url in replica_urls or []
+        ]
+        self.replica_max_lag_seconds = replica_max_lag_seconds
+        self.replica_check_interval_seconds = replica_check_interval_seconds
+        self._round_robin = itertools.count()
 
     async def dispose(self) -> None:
         await self.engine.dispose()
+        for replica in self.replicas:
+            await replica.engine.dispose()
         log.info("Database engine dispose")
 
     async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.session_factory() as session:
             yield session
 
+    def _read_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        healthy = [
+            replica
+            for replica in self.replicas
+            if replica.lag is not None and replica.lag <= self.replica_max_lag_seconds
+        ]
+        if not healthy:
+            # Нет реплик или все отстают - читаем с мастера
+            return self.session_factory
+        return healthy[next(self._round_robin) % len(healthy)].session_factory
+
+    # Только для чтения: сессия может прийти с реплики, запись туда упадет
+    def read_session(self) -> AsyncSession:
+        return self._read_session_factory()()
+
+    async def read_session_getter(self) -> AsyncGenerator[AsyncSession, None]:
+        async with self.read_session() as session:
+            yield session
+
+    async def _check_replica(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as connection:
+                lag = await asyncio.wait_for(
+                    connection.scalar(REPLICA_LAG_QUERY),
+                    self.replica_check_interval_seconds,
+                )
+            replica.lag = float(lag or 0)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if replica.lag is not None:
+                log.warning(
+                    "Replica %s is unavailable", replica.engine.url, exc_info=True
+                )
+            replica.lag = None
+
+    async def monitor_replicas(self) -> None:
+        while self.replicas:
+            await asyncio.gather(
+                *(self._check_replica(replica) for replica in self.replicas)
+            )
+            await asyncio.sleep(self.replica_check_interval_seconds)
+
 
 db_helper = DatabaseHelper(
     url=str(settings.db.url),
@@ -52,4 +148,7 @@ db_helper = DatabaseHelper(
     echo_pool=settings.db.echo_pool,
     pool_size=settings.db.pool_size,
     max_overflow=settings.db.max_overflow,
+    replica_urls=[str(url) for url in settings.db.replicas],
+    replica_max_lag_seconds=settings.db.replica_max_lag_seconds,
+    replica_check_interval_seconds=settings.db.replica_check_interval_seconds,
 )
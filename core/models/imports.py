@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    Table,
+    Column,
+    String,
+    Text,
+    Boolean,
+    DateTime,
+    Integer,
+    BigInteger,
+    ForeignKey,
+    Index,
+    text,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from core.models.base import Base
+
+
+class ImportJob(Base):
+    """Массовый импорт задач или заметок пользователя"""
+
+    __tablename__ = "import_jobs"
+    __table_args__ = (
+        # Очистка прерванных импортов: незавершенные без свежего прогресса
+        Index(
+            "ix_import_jobs_running",
+            "updated_at",
+            postgresql_where=text("status = 'running'"),
+        ),
+    )
+
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    format: Mapped[str] = mapped_column(String(16), nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(16), default="running", server_default="running", nullable=False
+    )
+    # Прогресс: разобрано строк, из них с ошибками, вставлено после слияния
+    processed_rows: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    failed_rows: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    imported_rows: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Таймстемпы
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Связи
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+
+class ImportJobError(Base):
+    """Строка файла импорта, не прошедшая проверку"""
+
+    __tablename__ = "import_job_errors"
+    __table_args__ = (
+        Index("ix_import_job_errors_job_id_line", "job_id", "line", "id"),
+    )
+
+    line: Mapped[int] = mapped_column(Integer, nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    # Связи
+    job_id: Mapped[int] = mapped_column(
+        ForeignKey("import_jobs.id", ondelete="CASCADE"), nullable=False
+    )
+
+
+# Промежуточные таблицы для COPY: строки живут от загрузки до слияния.
+# UNLOGGED: после сбоя незавершенный импорт все равно начинается заново
+import_staging_tasks_table = Table(
+    "import_staging_tasks",
+    Base.metadata,
+    Column("job_id", Integer, nullable=False, index=True),
+    Column("line", Integer, nullable=False),
+    Column("title", String(255), nullable=False),
+    Column("description", Text, nullable=True),
+    prefixes=["UNLOGGED"],
+)
+
+import_staging_notes_table = Table(
+    "import_staging_notes",
+    Base.metadata,
+    Column("job_id", Integer, nullable=False, index=True),
+    Column("line", Integer, nullable=False),
+    Column("content", Text, nullable=False),
+    Column("is_important", Boolean, nullable=False),
+    prefixes=["UNLOGGED"],
+)
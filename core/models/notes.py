@@ -1,11 +1,12 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Text, DateTime, Boolean, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from core.models.base import Base
+from core.models.search import search_vector
 
 
 if TYPE_CHECKING:
@@ -15,6 +16,20 @@ if TYPE_CHECKING:
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        Index("ix_notes_search_vector", "search_vector", postgresql_using="gin"),
+        # Список пользователя: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_notes_user_id_created_at", "user_id", "created_at", "id"),
+        # Фильтры и сортировки GET /notes/
+        Index("ix_notes_user_id_updated_at", "user_id", "updated_at", "id"),
+        Index(
+            "ix_notes_user_id_is_important_created_at",
+            "user_id",
+            "is_important",
+            "created_at",
+            "id",
+        ),
+    )
 
     content: Mapped[str] = mapped_column(Text, nullable=False)
     is_important: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -22,9 +37,20 @@ class Note(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # Сдвигается и триггерами на comments: валидатор для условных GET.
+    # clock_timestamp(), а не now(): время начала долгой транзакции
+    # оказалось бы старше уже видимых изменений
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.clock_timestamp(),
+    )
+    # Число комментариев, поддерживается триггерами на comments
+    comment_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
     )
+    # Полнотекстовый поиск
+    search_vector: Mapped[str] = search_vector(("content", "A"))
     # Связи
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -32,4 +58,6 @@ class Note(Base):
 
     # Отношения
     user: Mapped["User"] = relationship(back_populates="notes")
-    comments: Mapped["Comment"] = relationship(back_populates="note")
+    comments: Mapped[list["Comment"]] = relationship(
+        back_populates="note", cascade="all, delete-orphan", passive_deletes=True
+    )
@@ -0,0 +1,20 @@
+from sqlalchemy import Table, Column, Text, Float, DateTime, func
+
+from core.models.base import Base
+
+
+# Корзины rate limiter'а для нескольких воркеров.
+# UNLOGGED: данные служебные, WAL для них не нужен
+rate_limits_table = Table(
+    "auth_rate_limits",
+    Base.metadata,
+    Column("key", Text, primary_key=True),
+    Column("tokens", Float, nullable=False),
+    Column(
+        "updated_at",
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    ),
+    prefixes=["UNLOGGED"],
+)
@@ -1,24 +1,53 @@
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import DateTime, func, ForeignKey
+from sqlalchemy import DateTime, func, ForeignKey, Index, String, text
 
 from core.models.base import Base
 
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    # Таблица секционирована по месяцам expires_at: истекшие секции удаляются целиком
+    __table_args__ = (
+        # jti ищем вместе с expires_at (= exp токена), чтобы попасть в одну секцию
+        Index(
+            "ix_refresh_tokens_jti",
+            "jti",
+            "expires_at",
+            unique=True,
+            postgresql_include=["revoke", "user_id", "revoked_at"],
+        ),
+        # Отозванные при выходе и еще не истекшие токены - загрузка индекса отзыва
+        Index(
+            "ix_refresh_tokens_revoked",
+            "expires_at",
+            postgresql_include=["jti"],
+            postgresql_where=text(
+                "revoke AND revoke_reason IS DISTINCT FROM 'rotated'"
+            ),
+        ),
+        {"postgresql_partition_by": "RANGE (expires_at)"},
+    )
 
-    jti: Mapped[str] = mapped_column(unique=True, index=True, nullable=False)
+    # Ключ секционирования обязан входить в первичный ключ
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    jti: Mapped[str] = mapped_column(nullable=False)
     revoke: Mapped[bool] = mapped_column(default=False, nullable=False)
-    expires_at: Mapped[DateTime] = mapped_column(
+    revoked_at: Mapped[DateTime | None] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
     )
+    # logout - отозван пользователем, rotated - заменен новым при refresh
+    revoke_reason: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    expires_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+    )
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
 
     user_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
     user = relationship("User", back_populates="refresh_tokens")
@@ -0,0 +1,24 @@
+from sqlalchemy import Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import mapped_column, MappedColumn
+
+
+# Без стемминга: заметки пишут на разных языках
+SEARCH_CONFIG = "simple"
+
+
+def search_vector(*weighted: tuple[str, str]) -> MappedColumn:
+    """Генерируемая колонка tsvector из (колонка, вес) пар
+
+    Postgres пересчитывает ее сам при INSERT/UPDATE. deferred - чтобы
+    обычные запросы не тянули вектор из БД.
+    """
+    expression = " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted
+    )
+    return mapped_column(
+        TSVECTOR,
+        Computed(expression, persisted=True),
+        deferred=True,
+    )
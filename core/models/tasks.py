@@ -1,11 +1,12 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Text, DateTime, Boolean, ForeignKey, Integer
+from sqlalchemy import String, Text, DateTime, Boolean, ForeignKey, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from core.models.base import Base
+from core.models.search import search_vector
 
 
 if TYPE_CHECKING:
@@ -15,6 +16,27 @@ if TYPE_CHECKING:
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # Список пользователя: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_tasks_user_id_created_at", "user_id", "created_at", "id"),
+        # Фильтры и сортировки GET /tasks/
+        Index("ix_tasks_user_id_updated_at", "user_id", "updated_at", "id"),
+        Index("ix_tasks_user_id_title", "user_id", "title", "id"),
+        Index(
+            "ix_tasks_user_id_title_pattern",
+            "user_id",
+            "title",
+            postgresql_ops={"title": "varchar_pattern_ops"},
+        ),
+        Index(
+            "ix_tasks_user_id_is_completed_created_at",
+            "user_id",
+            "is_completed",
+            "created_at",
+            "id",
+        ),
+    )
 
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -23,9 +45,20 @@ class Task(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # Сдвигается и триггерами на comments: валидатор для условных GET.
+    # clock_timestamp(), а не now(): время начала долгой транзакции
+    # оказалось бы старше уже видимых изменений
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.clock_timestamp(),
+    )
+    # Число комментариев, поддерживается триггерами на comments
+    comment_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
     )
+    # Полнотекстовый поиск: заголовок важнее описания
+    search_vector: Mapped[str] = search_vector(("title", "A"), ("description", "B"))
     # Связи
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -33,5 +66,5 @@ class Task(Base):
     # Отношения
     user: Mapped["User"] = relationship(back_populates="tasks")
     comments: Mapped[list["Comment"]] = relationship(
-        back_populates="task", cascade="all, delete-orphan"
+        back_populates="task", cascade="all, delete-orphan", passive_deletes=True
     )
@@ -0,0 +1,11 @@
+from .base import OwnedRepository
+from .tasks import TaskRepository
+from .notes import NoteRepository
+from .comments import CommentRepository
+
+__all__ = (
+    "OwnedRepository",
+    "TaskRepository",
+    "NoteRepository",
+    "CommentRepository",
+)
@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Any, Generic, Sequence, TypeVar
+
+from sqlalchemy import (
+    Integer,
+    Select,
+    any_,
+    bindparam,
+    delete,
+    exists,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.models.base import Base
+
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+class OwnedRepository(Generic[ModelT]):
+    """Доступ к строкам одного пользователя
+
+    Каждый запрос уже содержит WHERE user_id = :uid. Чужие строки
+    не загружаются вовсе и для вызывающего кода неотличимы от
+    несуществующих.
+    """
+
+    model: type[ModelT]
+
+    def __init__(self, session: AsyncSession, user_id: int) -> None:
+        self.session = session
+        self.user_id = user_id
+
+    @property
+    def owned(self):
+        return self.model.user_id == self.user_id
+
+    def by_id(self, id: int):
+        return self.owned & (self.model.id == id)
+
+    def by_ids(self, ids: list[int]):
+        # = ANY($1::integer[]): один параметр и один план на любой размер списка
+        return self.owned & (
+            self.model.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+        )
+
+    def select(self, *options: Any) -> Select:
+        return select(self.model).where(self.owned).options(*options)
+
+    async def get(self, id: int, *options: Any) -> ModelT | None:
+        return await self.session.scalar(
+            select(self.model).where(self.by_id(id)).options(*options)
+        )
+
+    async def exists(self, id: int) -> bool:
+        return await self.session.scalar(select(exists().where(self.by_id(id))))
+
+    async def last_modified(self, id: int) -> datetime | None:
+        # Только updated_at - валидатор для условного GET без загрузки строки
+        return await self.session.scalar(
+            select(self.model.updated_at).where(self.by_id(id))
+        )
+
+    async def create(self, values: dict) -> ModelT:
+        # INSERT ... RETURNING сразу возвращает id и серверные значения
+        return await self.session.scalar(
+            insert(self.model)
+            .values(**values, user_id=self.user_id)
+            .returning(self.model)
+        )
+
+    async def create_many(self, rows: list[dict]) -> Sequence[ModelT]:
+        # Один многострочный INSERT ... RETURNING, порядок как во входе
+        result = await self.session.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            [{**row, "user_id": self.user_id} for row in rows],
+        )
+        return result.all()
+
+    async def update(self, id: int, values: dict) -> ModelT | None:
+        return await self.session.scalar(
+            update(self.model)
+            .where(self.by_id(id))
+            .values(**values)
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def update_many(self, ids: list[int], values: dict) -> Sequence[ModelT]:
+        result = await self.session.scalars(
+            update(self.model)
+            .where(self.by_ids(ids))
+            .values(**values)
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        return result.all()
+
+    async def delete(self, id: int) -> bool:
+        # Дочерние строки удалит ON DELETE CASCADE в БД
+        deleted = await self.session.scalar(
+            delete(self.model)
+            .where(self.by_id(id))
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        return deleted is not None
+
+    async def delete_many(self, ids: list[int]) -> set[int]:
+        result = await self.session.scalars(
+            delete(self.model)
+            .where(self.by_ids(ids))
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        return set(result.all())
@@ -0,0 +1,33 @@
+from sqlalchemy import Select, insert, literal, null, select
+
+from core.models import Comment, Note, Task
+from core.repositories.base import OwnedRepository
+
+
+class CommentRepository(OwnedRepository[Comment]):
+    model = Comment
+
+    def for_parent(self, parent: type[Task] | type[Note], parent_id: int) -> Select:
+        column = Comment.task_id if parent is Task else Comment.note_id
+        return self.select().where(column == parent_id)
+
+    async def create_for_parent(
+        self,
+        parent: type[Task] | type[Note],
+        parent_id: int,
+        content: str,
+    ) -> Comment | None:
+        # INSERT ... SELECT: строка появится, только если родитель
+        # существует и принадлежит пользователю
+        source = select(
+            literal(content),
+            parent.id if parent is Task else null(),
+            parent.id if parent is Note else null(),
+            literal(self.user_id),
+        ).where((parent.id == parent_id) & (parent.user_id == self.user_id))
+
+        return await self.session.scalar(
+            insert(Comment)
+            .from_select(["content", "task_id", "note_id", "user_id"], source)
+            .returning(Comment)
+        )
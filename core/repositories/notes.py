@@ -0,0 +1,6 @@
+from core.models import Note
+from core.repositories.base import OwnedRepository
+
+
+class NoteRepository(OwnedRepository[Note]):
+    model = Note
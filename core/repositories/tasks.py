@@ -0,0 +1,6 @@
+from core.models import Task
+from core.repositories.base import OwnedRepository
+
+
+class TaskRepository(OwnedRepository[Task]):
+    model = Task
@@ -10,9 +10,11 @@ from core.config import settings
 from core.models import User
 from core.models.db_helper import db_helper
 from core.schemas.auth import TokenPair
+from core.dependencies.auth import login_rate_limit, register_rate_limit
 from core.dependencies.users import get_current_user
 
 from auth.services import auth_services
+from auth.token_cache import verified_token_cache
 from auth.utils import set_jwt_cookie
 
 
@@ -22,7 +24,7 @@ router = APIRouter(
 )
 
 
-@router.post("/register")
+@router.post("/register", dependencies=[Depends(register_rate_limit)])
 async def registration_user(
     response: Response,  # Ответ
     email: Annotated[EmailStr, Form()],
@@ -48,7 +50,11 @@ async def registration_user(
     return {"message": "User registered successfully"}
 
 
-@router.post("/login", response_model=TokenPair)
+@router.post(
+    "/login",
+    response_model=TokenPair,
+    dependencies=[Depends(login_rate_limit)],
+)
 async def login_user(
     response: Response,  # Ответ
     username: Annotated[str, Form()],
@@ -117,6 +123,10 @@ async def logout(
         refresh_token=refresh_token,
         session=session,
     )
+    # Убираем текущий access token из кэша проверенных
+    access_token = request.cookies.get("access_token")
+    if access_token:
+        verified_token_cache.discard(access_token)
     # Удаляем Куки
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
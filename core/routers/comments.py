@@ -1,13 +1,21 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.params import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
-from core.dependencies.users import get_current_user
-from core.models import User
+from core.dependencies.pagination import PageParams
+from core.dependencies.comments import comment_shape
+from core.dependencies.users import get_current_user_claims
 from core.models.db_helper import db_helper
+from core.schemas.pagination import Page
+from core.schemas.users import UserClaims
 from core.schemas.comments import CommentCreate, CommentResponse, CommentUpdate
 from core.services.comments import comment_services
+from core.services.conditional import conditional_services
+from core.services.notes import note_services
+from core.services.tasks import task_services
+from core.services.loading import ResponseShape
+from core.services.serialization import page_response
 
 
 router = APIRouter(prefix=settings.prefix.comments, tags=["Comments"])
@@ -18,7 +26,7 @@ async def create_comments_for_task(
     task_id: int,
     comment_data: CommentCreate,
     session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
     # Автоматически привязываем comment к task
     comment_create = CommentCreate(
@@ -31,25 +39,45 @@ async def create_comments_for_task(
         comment_create=comment_create,
         session=session,
         current_user=current_user,
+        task_id=task_id,
     )
 
     return comment
 
 
-@router.get("/tasks/{task_id}/comments", response_model=list[CommentResponse])
+@router.get("/tasks/{task_id}/comments", response_model=Page[CommentResponse])
 async def get_task_comments(
     task_id: int,
-    session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    page: PageParams = Depends(),
+    shape: ResponseShape = Depends(comment_shape),
+    session: AsyncSession = Depends(db_helper.read_session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
+    # Изменения комментариев сдвигают updated_at родителя
+    updated_at = await task_services.get_task_last_modified(
+        task_id=task_id,
+        session=session,
+        current_user=current_user,
+    )
+    etag = conditional_services.resource_etag(updated_at, request)
+    if conditional_services.is_not_modified(request, etag, updated_at):
+        return conditional_services.not_modified(etag, updated_at)
+
     # Получаем все task comments
-    comments = await comment_services.get_task_comments(
+    comments, next_cursor = await comment_services.get_task_comments(
         task_id=task_id,
         session=session,
         current_user=current_user,
+        cursor=page.cursor,
+        limit=page.limit,
     )
 
-    return comments
+    return page_response(
+        (shape.dump(comment) for comment in comments),
+        next_cursor,
+        headers=conditional_services.headers(etag, updated_at),
+    )
 
 
 @router.post("/notes/{note_id}/comments", response_model=CommentResponse)
@@ -57,7 +85,7 @@ async def create_comment_for_note(
     note_id: int,
     comment_data: CommentCreate,
     session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
     # Автоматически привязываем comment к note
     comment_create = CommentCreate(
@@ -70,25 +98,45 @@ async def create_comment_for_note(
         comment_create=comment_create,
         session=session,
         current_user=current_user,
+        note_id=note_id,
     )
 
     return comment
 
 
-@router.get("/notes/{note_id}/comments", response_model=list[CommentResponse])
+@router.get("/notes/{note_id}/comments", response_model=Page[CommentResponse])
 async def get_note_comments(
     note_id: int,
-    session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    page: PageParams = Depends(),
+    shape: ResponseShape = Depends(comment_shape),
+    session: AsyncSession = Depends(db_helper.read_session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
+    # Изменения комментариев сдвигают updated_at родителя
+    updated_at = await note_services.get_note_last_modified(
+        note_id=note_id,
+        session=session,
+        current_user=current_user,
+    )
+    etag = conditional_services.resource_etag(updated_at, request)
+    if conditional_services.is_not_modified(request, etag, updated_at):
+        return conditional_services.not_modified(etag, updated_at)
+
     # Получаем все note comments
-    comments = await comment_services.get_note_comments(
+    comments, next_cursor = await comment_services.get_note_comments(
         note_id=note_id,
         session=session,
         current_user=current_user,
+        cursor=page.cursor,
+        limit=page.limit,
     )
 
-    return comments
+    return page_response(
+        (shape.dump(comment) for comment in comments),
+        next_cursor,
+        headers=conditional_services.headers(etag, updated_at),
+    )
 
 
 @router.put("/{comment_id}", response_model=CommentResponse)
@@ -96,7 +144,7 @@ async def update_comment(
     comment_id: int,
     comment_update: CommentUpdate,
     session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
     # Обновляем comment
     comment = await comment_services.update_comment(
@@ -113,7 +161,7 @@ async def update_comment(
 async def delete_comment(
     comment_id: int,
     session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
     # Удаляем comment
     await comment_services.delete_comment(
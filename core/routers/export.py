@@ -0,0 +1,41 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query, Request
+from fastapi.params import Depends
+from fastapi.responses import StreamingResponse
+
+from core.config import settings
+from core.dependencies.users import get_current_user_claims
+from core.models.db_helper import db_helper
+from core.schemas.users import UserClaims
+from core.services.export import ExportFormat, MEDIA_TYPES, export_services
+
+router = APIRouter(prefix=settings.prefix.export, tags=["Export"])
+
+
+@router.get("/", response_class=StreamingResponse)
+async def export_data(
+    request: Request,
+    format: Annotated[ExportFormat, Query()] = "ndjson",
+    current_user: UserClaims = Depends(get_current_user_claims),
+):
+    # gzip только если клиент его принимает
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {
+        "Content-Disposition": f'attachment; filename="export.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    # Выгружаем все данные user; своя сессия живет, пока идет ответ
+    return StreamingResponse(
+        export_services.stream(
+            session=db_helper.read_session(),
+            user_id=current_user.id,
+            format=format,
+            compress=compress,
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
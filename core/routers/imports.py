@@ -0,0 +1,73 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query, Request, status
+from fastapi.params import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.dependencies.pagination import PageParams
+from core.dependencies.users import get_current_user_claims
+from core.models.db_helper import db_helper
+from core.schemas.imports import ImportJobResponse, ImportJobErrorResponse
+from core.schemas.pagination import Page
+from core.schemas.users import UserClaims
+from core.services.imports import ImportFormat, ImportKind, import_services
+
+router = APIRouter(prefix=settings.prefix.imports, tags=["Imports"])
+
+
+@router.post(
+    "/",
+    response_model=ImportJobResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_import(
+    request: Request,
+    kind: Annotated[ImportKind, Query()],
+    format: Annotated[ImportFormat, Query()] = "ndjson",
+    session: AsyncSession = Depends(db_helper.session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
+):
+    # Загружаем tasks или notes из тела запроса по мере его получения
+    job = await import_services.run_import(
+        chunks=request.stream(),
+        kind=kind,
+        format=format,
+        session=session,
+        current_user=current_user,
+    )
+
+    return job
+
+
+@router.get("/{job_id}", response_model=ImportJobResponse)
+async def get_import(
+    job_id: int,
+    session: AsyncSession = Depends(db_helper.session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
+):
+    # Получаем прогресс импорта; читаем с мастера, чтобы видеть последние пачки
+    return await import_services.get_job(
+        job_id=job_id,
+        session=session,
+        current_user=current_user,
+    )
+
+
+@router.get("/{job_id}/errors", response_model=Page[ImportJobErrorResponse])
+async def get_import_errors(
+    job_id: int,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(db_helper.session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
+):
+    # Получаем ошибки по строкам файла
+    errors, next_cursor = await import_services.get_errors(
+        job_id=job_id,
+        session=session,
+        current_user=current_user,
+        cursor=page.cursor,
+        limit=page.limit,
+    )
+
+    return {"items": errors, "next_cursor": next_cursor}
@@ -1,12 +1,24 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.params import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
-from core.dependencies.users import get_current_user
-from core.models import User
+from core.dependencies.pagination import PageParams
+from core.dependencies.notes import note_filters, note_shape
+from core.dependencies.users import get_current_user_claims
 from core.models.db_helper import db_helper
-from core.schemas.notes import NoteResponse, NoteCreate, NoteUpdate
+from core.schemas.pagination import Page
+from core.schemas.users import UserClaims
+from core.schemas.notes import (
+    NoteResponse,
+    NoteSparseResponse,
+    NoteCreate,
+    NoteUpdate,
+    NoteFilters,
+)
+from core.services.conditional import conditional_services
+from core.services.loading import ResponseShape
+from core.services.serialization import json_response, page_response
 from core.services.notes import note_services
 
 router = APIRouter(
@@ -19,7 +31,7 @@ router = APIRouter(
 async def create_note(
     note_create: NoteCreate,
     session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
     # Создаем note
     note = await note_services.create_note(
@@ -31,34 +43,77 @@ async def create_note(
     return note
 
 
-@router.get("/{note_id}", response_model=NoteResponse)
+@router.get(
+    "/{note_id}",
+    response_model=NoteSparseResponse,
+    response_model_exclude_unset=True,
+)
 async def get_note(
     note_id: int,
-    session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    shape: ResponseShape = Depends(note_shape),
+    session: AsyncSession = Depends(db_helper.read_session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
+    # If-None-Match / If-Modified-Since проверяем до загрузки note
+    updated_at = await note_services.get_note_last_modified(
+        note_id=note_id,
+        session=session,
+        current_user=current_user,
+    )
+    etag = conditional_services.resource_etag(updated_at, request)
+    if conditional_services.is_not_modified(request, etag, updated_at):
+        return conditional_services.not_modified(etag, updated_at)
+
     # Получаем конкретную note
     note = await note_services.get_note(
         note_id=note_id,
         session=session,
         current_user=current_user,
+        shape=shape,
     )
 
-    return note
+    return json_response(
+        shape.dump(note),
+        headers=conditional_services.headers(etag, updated_at),
+    )
 
 
-@router.get("/", response_model=list[NoteResponse])
+@router.get(
+    "/",
+    response_model=Page[NoteSparseResponse],
+    response_model_exclude_unset=True,
+)
 async def get_all_notes(
-    session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    shape: ResponseShape = Depends(note_shape),
+    filters: NoteFilters = Depends(note_filters),
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(db_helper.read_session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
+    # Повторный опрос без изменений - 304 без загрузки списка
+    etag = await conditional_services.list_etag(
+        session, current_user.id, "note", request
+    )
+    if conditional_services.is_not_modified(request, etag):
+        return conditional_services.not_modified(etag)
+
     # Получаем все user notes
-    notes = await note_services.get_all_notes(
+    notes, next_cursor = await note_services.get_all_notes(
         session=session,
         current_user=current_user,
+        filters=filters,
+        shape=shape,
+        cursor=page.cursor,
+        limit=page.limit,
     )
 
-    return notes
+    return page_response(
+        (shape.dump(note) for note in notes),
+        next_cursor,
+        headers=conditional_services.headers(etag),
+    )
 
 
 @router.put("/{note_id}", response_model=NoteResponse)
@@ -66,12 +121,12 @@ async def update_note(
     note_id: int,
     note_update: NoteUpdate,
     session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
     # Обновляем note
     note = await note_services.update_note(
         note_id=note_id,
-        note_update=note_update,
+        data=note_update,
         session=session,
         current_user=current_user,
     )
@@ -83,7 +138,7 @@ async def update_note(
 async def delete_note(
     note_id: int,
     session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
     # Удаляем note
     await note_services.delete_note(
@@ -0,0 +1,39 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+from fastapi.params import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.dependencies.pagination import PageParams
+from core.dependencies.users import get_current_user_claims
+from core.models.db_helper import db_helper
+from core.schemas.pagination import Page
+from core.schemas.search import SearchHit
+from core.schemas.users import UserClaims
+from core.services.search import SearchKind, search_services
+from core.services.serialization import page_response
+
+router = APIRouter(prefix=settings.prefix.search, tags=["Search"])
+
+
+@router.get("/", response_model=Page[SearchHit])
+async def search(
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    kind: Annotated[list[SearchKind] | None, Query()] = None,
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(db_helper.read_session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
+):
+    # Ищем по задачам, заметкам и комментариям пользователя
+    hits, next_cursor = await search_services.search(
+        query=q,
+        session=session,
+        current_user=current_user,
+        kinds=kind or ("task", "note", "comment"),
+        cursor=page.cursor,
+        limit=page.limit,
+    )
+
+    # Колонки строк совпадают с полями SearchHit
+    return page_response((dict(hit._mapping) for hit in hits), next_cursor)
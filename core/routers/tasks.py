@@ -1,12 +1,28 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.params import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
-from core.dependencies.users import get_current_user
-from core.models import User
+from core.dependencies.pagination import PageParams
+from core.dependencies.tasks import task_filters, task_shape
+from core.dependencies.users import get_current_user_claims
 from core.models.db_helper import db_helper
-from core.schemas.tasks import TaskResponse, TaskCreate, TaskUpdate
+from core.schemas.pagination import Page
+from core.schemas.users import UserClaims
+from core.schemas.tasks import (
+    TaskResponse,
+    TaskSparseResponse,
+    TaskCreate,
+    TaskUpdate,
+    TaskBatchCreate,
+    TaskBatchUpdate,
+    TaskBatchDelete,
+    TaskBatchResponse,
+    TaskFilters,
+)
+from core.services.conditional import conditional_services
+from core.services.loading import ResponseShape
+from core.services.serialization import json_response, page_response
 from core.services.tasks import task_services
 
 router = APIRouter(prefix=settings.prefix.tasks, tags=["Tasks"])
@@ -16,7 +32,7 @@ router = APIRouter(prefix=settings.prefix.tasks, tags=["Tasks"])
 async def create_task(
     task_create: TaskCreate,
     session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
     # Создаем task
     task = await task_services.create_task(
@@ -28,34 +44,126 @@ async def create_task(
     return task
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
+# Batch маршруты объявлены до /{task_id}
+@router.post("/batch", response_model=TaskBatchResponse)
+async def create_tasks_batch(
+    data: TaskBatchCreate,
+    session: AsyncSession = Depends(db_helper.session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
+):
+    # Создаем несколько tasks одним запросом
+    items = await task_services.create_tasks(
+        data=data,
+        session=session,
+        current_user=current_user,
+    )
+
+    return {"items": items}
+
+
+@router.patch("/batch", response_model=TaskBatchResponse)
+async def update_tasks_batch(
+    data: TaskBatchUpdate,
+    session: AsyncSession = Depends(db_helper.session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
+):
+    # Одинаково обновляем несколько tasks
+    items = await task_services.update_tasks(
+        data=data,
+        session=session,
+        current_user=current_user,
+    )
+
+    return {"items": items}
+
+
+@router.post("/batch/delete", response_model=TaskBatchResponse)
+async def delete_tasks_batch(
+    data: TaskBatchDelete,
+    session: AsyncSession = Depends(db_helper.session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
+):
+    # Удаляем несколько tasks
+    items = await task_services.delete_tasks(
+        data=data,
+        session=session,
+        current_user=current_user,
+    )
+
+    return {"items": items}
+
+
+@router.get(
+    "/{task_id}",
+    response_model=TaskSparseResponse,
+    response_model_exclude_unset=True,
+)
 async def get_task(
     task_id: int,
-    session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    shape: ResponseShape = Depends(task_shape),
+    session: AsyncSession = Depends(db_helper.read_session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
+    # If-None-Match / If-Modified-Since проверяем до загрузки task
+    updated_at = await task_services.get_task_last_modified(
+        task_id=task_id,
+        session=session,
+        current_user=current_user,
+    )
+    etag = conditional_services.resource_etag(updated_at, request)
+    if conditional_services.is_not_modified(request, etag, updated_at):
+        return conditional_services.not_modified(etag, updated_at)
+
     # Получаем конкретную task
     task = await task_services.get_task(
         task_id=task_id,
         session=session,
         current_user=current_user,
+        shape=shape,
     )
 
-    return task
+    return json_response(
+        shape.dump(task),
+        headers=conditional_services.headers(etag, updated_at),
+    )
 
 
-@router.get("/", response_model=list[TaskResponse])
+@router.get(
+    "/",
+    response_model=Page[TaskSparseResponse],
+    response_model_exclude_unset=True,
+)
 async def get_all_tasks(
-    session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    shape: ResponseShape = Depends(task_shape),
+    filters: TaskFilters = Depends(task_filters),
+    page: PageParams = Depends(),
+    session: AsyncSession = Depends(db_helper.read_session_getter),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
+    # Повторный опрос без изменений - 304 без загрузки списка
+    etag = await conditional_services.list_etag(
+        session, current_user.id, "task", request
+    )
+    if conditional_services.is_not_modified(request, etag):
+        return conditional_services.not_modified(etag)
+
     # Получаем все user tasks
-    tasks = await task_services.get_all_tasks(
+    tasks, next_cursor = await task_services.get_all_tasks(
         session=session,
         current_user=current_user,
+        filters=filters,
+        shape=shape,
+        cursor=page.cursor,
+        limit=page.limit,
     )
 
-    return tasks
+    return page_response(
+        (shape.dump(task) for task in tasks),
+        next_cursor,
+        headers=conditional_services.headers(etag),
+    )
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
@@ -63,12 +171,12 @@ async def update_task(
     task_id: int,
     task_update: TaskUpdate,
     session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
     # Обновляем task
     task = await task_services.update_task(
         task_id=task_id,
-        task_update=task_update,
+        data=task_update,
         session=session,
         current_user=current_user,
     )
@@ -80,7 +188,7 @@ async def update_task(
 async def delete_task(
     task_id: int,
     session: AsyncSession = Depends(db_helper.session_getter),
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_user_claims),
 ):
     # Удаляем task
     await task_services.delete_task(
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 from fastapi.params import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -7,7 +7,7 @@ from core.dependencies.users import get_current_user
 from core.models import User
 from core.services.users import user_services
 from core.models.db_helper import db_helper
-from core.schemas.users import UserUpdate, UserResponse
+from core.schemas.users import UserUpdate, UserResponse, AccountDeletionResponse
 
 from fastapi import status
 
@@ -39,8 +39,8 @@ async def update_user(
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
     # Обновляем user
-    user = await user_services.update_user(
-        current_user=current_user,
+    user = await user_services.update_user_profile(
+        user=current_user,
         data=data,
         session=session,
     )
@@ -48,15 +48,34 @@ async def update_user(
     return user
 
 
-@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/me",
+    response_model=AccountDeletionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def delete_user(
+    response: Response,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    # Удаляем user
-    await user_services.delete_user(
-        current_user=current_user,
+    # Ставим user в очередь на удаление, данные удаляются в фоне
+    deletion = await user_services.delete_user_account(
+        user=current_user,
         session=session,
     )
+    response.headers["Location"] = f"{settings.prefix.users}/deletions/{deletion.token}"
+
+    return deletion
 
-    return {"message": "User deleted successfully"}
+
+# Без авторизации: после удаления пользователя его токены недействительны
+@router.get("/deletions/{token}", response_model=AccountDeletionResponse)
+async def get_account_deletion(
+    token: str,
+    session: AsyncSession = Depends(db_helper.session_getter),
+):
+    # Получаем статус удаления аккаунта
+    return await user_services.get_account_deletion(
+        token=token,
+        session=session,
+    )
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ImportJobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: Literal["task", "note"]
+    format: Literal["ndjson", "csv"]
+    status: Literal["running", "completed", "failed"]
+    processed_rows: int = 0
+    failed_rows: int = 0
+    imported_rows: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class ImportJobErrorResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    # Номер строки во входном файле, с единицы
+    line: int
+    message: str
@@ -1,7 +1,10 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Literal, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 
+from core.schemas.comments import CommentResponse
+
 
 class BaseNote(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -28,3 +31,32 @@ class NoteResponse(BaseModel):
     is_important: bool = False
     created_at: datetime
     updated_at: datetime
+    comment_count: int = 0
+
+
+class NoteSparseResponse(BaseModel):
+    """Ответ с ?fields= / ?include=: только запрошенные поля"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: Optional[int] = None
+    content: Optional[str] = None
+    is_important: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    comment_count: Optional[int] = None
+    comments: Optional[list[CommentResponse]] = None
+
+
+# Только поля, под которые есть индекс; "-" - по убыванию
+NoteSort = Literal["created_at", "-created_at", "updated_at", "-updated_at"]
+
+
+@dataclass
+class NoteFilters:
+    is_important: bool | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    updated_after: datetime | None = None
+    updated_before: datetime | None = None
+    sort: NoteSort = "-created_at"
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SearchHit(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    kind: Literal["task", "note", "comment"]
+    id: int
+    rank: float
+    # Фрагмент текста с найденными словами в <b>...</b>
+    snippet: str
+    created_at: datetime
@@ -1,7 +1,11 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Literal, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 
+from core.config import settings
+from core.schemas.comments import CommentResponse
+
 
 class BaseTask(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -31,3 +35,62 @@ class TaskResponse(BaseModel):
     is_completed: bool = False
     created_at: datetime
     updated_at: datetime
+    comment_count: int = 0
+
+
+class TaskSparseResponse(BaseModel):
+    """Ответ с ?fields= / ?include=: только запрошенные поля"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: Optional[int] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    is_completed: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    comment_count: Optional[int] = None
+    comments: Optional[list[CommentResponse]] = None
+
+
+class TaskBatchCreate(BaseModel):
+    items: list[TaskCreate] = Field(
+        ..., min_length=1, max_length=settings.batch.max_size
+    )
+
+
+class TaskBatchUpdate(BaseModel):
+    # Одни и те же изменения для всех задач, например is_completed=true
+    ids: list[int] = Field(..., min_length=1, max_length=settings.batch.max_size)
+    data: TaskUpdate
+
+
+class TaskBatchDelete(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=settings.batch.max_size)
+
+
+class TaskBatchItemResult(BaseModel):
+    id: int
+    status: Literal["created", "updated", "deleted", "not_found"]
+    task: Optional[TaskResponse] = None
+
+
+class TaskBatchResponse(BaseModel):
+    items: list[TaskBatchItemResult]
+
+
+# Только поля, под которые есть индекс; "-" - по убыванию
+TaskSort = Literal[
+    "created_at", "-created_at", "updated_at", "-updated_at", "title", "-title"
+]
+
+
+@dataclass
+class TaskFilters:
+    is_completed: bool | None = None
+    title_prefix: str | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    updated_after: datetime | None = None
+    updated_before: datetime | None = None
+    sort: TaskSort = "-created_at"
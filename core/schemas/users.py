@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import datetime
+from typing import Literal, Optional
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 
 
@@ -24,3 +25,23 @@ class UserResponse(BaseModel):
     email: EmailStr
     is_active: bool = True
     is_verified: bool = False
+
+
+class UserClaims(BaseModel):
+    """Пользователь, восстановленный только из claims access токена"""
+
+    id: int
+    username: str
+    email: EmailStr
+
+
+class AccountDeletionResponse(BaseModel):
+    """Состояние фонового удаления аккаунта"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    token: str
+    status: Literal["pending", "running", "completed", "failed"]
+    deleted_rows: int = 0
+    created_at: datetime
+    finished_at: Optional[datetime] = None
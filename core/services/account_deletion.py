@@ -0,0 +1,185 @@
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import settings
+
+
+log = logging.getLogger(__name__)
+
+# (таблица, ключ строки, выборка строк пользователя) в порядке удаления.
+# Сначала комментарии, включая чужие к задачам и заметкам пользователя,
+# иначе каскад от одной порции задач может затронуть неограниченно строк
+PURGE_STEPS = [
+    ("comments", "id", "SELECT id FROM comments WHERE user_id = :user_id"),
+    (
+        "comments",
+        "id",
+        "SELECT c.id FROM comments c JOIN tasks t ON t.id = c.task_id "
+        "WHERE t.user_id = :user_id",
+    ),
+    (
+        "comments",
+        "id",
+        "SELECT c.id FROM comments c JOIN notes n ON n.id = c.note_id "
+        "WHERE n.user_id = :user_id",
+    ),
+    ("tasks", "id", "SELECT id FROM tasks WHERE user_id = :user_id"),
+    ("notes", "id", "SELECT id FROM notes WHERE user_id = :user_id"),
+    # Таблица секционирована: ключ строки включает expires_at
+    (
+        "refresh_tokens",
+        "id, expires_at",
+        "SELECT id, expires_at FROM refresh_tokens WHERE user_id = :user_id",
+    ),
+]
+
+
+class AccountDeletionWorker:
+    """Фоновое удаление аккаунтов порциями
+
+    Каждая порция - отдельная короткая транзакция на chunk_size строк,
+    поэтому удаление большого аккаунта не держит блокировки и не раздувает
+    WAL одной транзакцией. Строка users удаляется последней, оставшееся
+    (например, созданное во время удаления) добирает ON DELETE CASCADE.
+    Задачи забираются через FOR UPDATE SKIP LOCKED, так что воркеры
+    разных процессов не мешают друг другу.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        poll_interval_seconds: float = 30,
+        lease_seconds: float = 300,
+        max_attempts: int = 5,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._wakeup = asyncio.Event()
+
+    # Новая задача в этом процессе - не ждем следующего опроса
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def claim(self, engine: AsyncEngine) -> tuple[int, int] | None:
+        async with engine.begin() as connection:
+            row = (
+                await connection.execute(
+                    text(
+                        "SELECT id, user_id FROM account_deletions "
+                        "WHERE status = 'pending' OR (status = 'running' "
+                        "AND updated_at < now() - make_interval(secs => :lease)) "
+                        "ORDER BY created_at LIMIT 1 FOR UPDATE SKIP LOCKED"
+                    ),
+                    {"lease": self.lease_seconds},
+                )
+            ).first()
+            if row is None:
+                return None
+
+            await connection.execute(
+                text(
+                    "UPDATE account_deletions SET status = 'running', "
+                    "attempts = attempts + 1, updated_at = now() WHERE id = :id"
+                ),
+                {"id": row.id},
+            )
+            return row.id, row.user_id
+
+    async def purge(self, engine: AsyncEngine, job_id: int, user_id: int) -> None:
+        for table, key, source in PURGE_STEPS:
+            while True:
+                async with engine.begin() as connection:
+                    result = await connection.execute(
+                        text(
+                            f"DELETE FROM {table} WHERE ({key}) IN "
+                            f"({source} LIMIT :limit)"
+                        ),
+                        {"user_id": user_id, "limit": self.chunk_size},
+                    )
+                    # Прогресс и продление аренды в той же транзакции
+                    await connection.execute(
+                        text(
+                            "UPDATE account_deletions SET updated_at = now(), "
+                            "deleted_rows = deleted_rows + :count WHERE id = :id"
+                        ),
+                        {"id": job_id, "count": result.rowcount},
+                    )
+                if result.rowcount < self.chunk_size:
+                    break
+
+        async with engine.begin() as connection:
+            await connection.execute(
+                text("DELETE FROM users WHERE id = :user_id"),
+                {"user_id": user_id},
+            )
+            # Счетчики пишут триггеры, в том числе при каскаде выше
+            await connection.execute(
+                text("DELETE FROM user_change_versions WHERE user_id = :user_id"),
+                {"user_id": user_id},
+            )
+            await connection.execute(
+                text(
+                    "UPDATE account_deletions SET status = 'completed', "
+                    "error = NULL, updated_at = now(), finished_at = now() "
+                    "WHERE id = :id"
+                ),
+                {"id": job_id},
+            )
+
+    async def fail(self, engine: AsyncEngine, job_id: int, error: str) -> None:
+        # Повторяем до max_attempts, потом задача остается failed
+        async with engine.begin() as connection:
+            await connection.execute(
+                text(
+                    "UPDATE account_deletions SET error = :error, updated_at = now(), "
+                    "status = CASE WHEN attempts >= :max_attempts "
+                    "THEN 'failed' ELSE 'pending' END, "
+                    "finished_at = CASE WHEN attempts >= :max_attempts "
+                    "THEN now() END "
+                    "WHERE id = :id"
+                ),
+                {"id": job_id, "error": error, "max_attempts": self.max_attempts},
+            )
+
+    async def process_pending(self, engine: AsyncEngine) -> int:
+        processed = 0
+        while (job := await self.claim(engine)) is not None:
+            job_id, user_id = job
+            try:
+                await self.purge(engine, job_id, user_id)
+                log.info("Account %d deleted (job %d)", user_id, job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.exception("Account deletion job %d failed", job_id)
+                await self.fail(engine, job_id, repr(e))
+            processed += 1
+        return processed
+
+    async def run(self, engine: AsyncEngine) -> None:
+        while True:
+            # Сбрасываем до обработки, чтобы не потерять wake() во время нее
+            self._wakeup.clear()
+            try:
+                await self.process_pending(engine)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Account deletion worker failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+account_deletion_worker = AccountDeletionWorker(
+    chunk_size=settings.account_deletion.chunk_size,
+    poll_interval_seconds=settings.account_deletion.poll_interval_seconds,
+    lease_seconds=settings.account_deletion.lease_seconds,
+    max_attempts=settings.account_deletion.max_attempts,
+)
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from core.config import settings
+
+
+log = logging.getLogger(__name__)
+
+# (таблица родителя, колонка в comments)
+PARENTS = [("tasks", "task_id"), ("notes", "note_id")]
+# Сверкой занимается один воркер
+ADVISORY_LOCK_ID = 0x636D_6E74  # "cmnt"
+
+
+class CommentCountsRepair:
+    """Сверка comment_count у задач и заметок
+
+    Счетчики поддерживаются триггерами на comments, но могут разойтись
+    после ручных правок или отключенных триггеров (session_replication_role).
+    Родители перебираются по id пачками, каждая пачка - отдельная короткая
+    транзакция, обновляются только строки с расхождением.
+    """
+
+    def __init__(self, batch_size: int = 1000, interval_seconds: float = 86400) -> None:
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+
+    async def repair_batch(
+        self,
+        connection: AsyncConnection,
+        table: str,
+        column: str,
+        after_id: int,
+    ) -> tuple[int | None, int]:
+        # Граница пачки: последний id или None, если строк больше нет
+        last_id = await connection.scalar(
+            text(
+                f"SELECT max(id) FROM ("
+                f"SELECT id FROM {table} WHERE id > :after_id "
+                f"ORDER BY id LIMIT :limit) batch"
+            ),
+            {"after_id": after_id, "limit": self.batch_size},
+        )
+        if last_id is None:
+            return None, 0
+
+        # Сначала блокируем родителей пачки: триггеры на comments ждут нас,
+        # а комментарии, закоммиченные до блокировки, уже видны.
+        # Считаем следующим запросом - в READ COMMITTED у него свежий снимок,
+        # иначе в строку записалось бы устаревшее значение
+        await connection.execute(
+            text(
+                f"SELECT id FROM {table} "
+                f"WHERE id > :after_id AND id <= :last_id "
+                f"ORDER BY id FOR UPDATE"
+            ),
+            {"after_id": after_id, "last_id": last_id},
+        )
+        result = await connection.execute(
+            text(
+                f"""
+                UPDATE {table} p SET comment_count = actual.n,
+                    updated_at = clock_timestamp()
+                FROM (
+                    SELECT b.id, count(c.id) AS n
+                    FROM {table} b
+                    LEFT JOIN comments c ON c.{column} = b.id
+                    WHERE b.id > :after_id AND b.id <= :last_id
+                    GROUP BY b.id
+                ) actual
+                WHERE p.id = actual.id AND p.comment_count <> actual.n
+                """
+            ),
+            {"after_id": after_id, "last_id": last_id},
+        )
+        return last_id, result.rowcount
+
+    async def repair(self, engine: AsyncEngine) -> dict[str, int]:
+        fixed = {}
+        for table, column in PARENTS:
+            fixed[table] = 0
+            after_id = 0
+            while True:
+                async with engine.begin() as connection:
+                    # Блокировка на транзакцию: пачку обрабатывает один воркер
+                    locked = await connection.scalar(
+                        text("SELECT pg_try_advisory_xact_lock(:id)"),
+                        {"id": ADVISORY_LOCK_ID},
+                    )
+                    if not locked:
+                        return fixed
+                    last_id, count = await self.repair_batch(
+                        connection, table, column, after_id
+                    )
+                if last_id is None:
+                    break
+                fixed[table] += count
+                after_id = last_id
+
+        if any(fixed.values()):
+            log.warning("comment_count drift repaired: %s", fixed)
+        return fixed
+
+    async def run(self, engine: AsyncEngine) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.repair(engine)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("comment_count repair failed")
+
+
+comment_counts_repair = CommentCountsRepair(
+    batch_size=settings.comment_counters.repair_batch_size,
+    interval_seconds=settings.comment_counters.repair_interval_seconds,
+)
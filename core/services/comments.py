@@ -1,14 +1,14 @@
 from typing import Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, Result
 
+from core.config import settings
 from core.models import Comment, User, Task, Note
+from core.repositories import CommentRepository, NoteRepository, TaskRepository
 from core.schemas.comments import CommentCreate, CommentUpdate
-from core.exceptions.comments import (
-    CommentNotFoundException,
-    CommentAccessDeniedException,
-)
+from core.schemas.users import UserClaims
+from core.services.pagination import paginate
+from core.exceptions.comments import CommentNotFoundException
 from core.exceptions.tasks import TaskNotFoundException
 from core.exceptions.notes import NoteNotFoundException
 from core.exceptions import ValidationException
@@ -19,7 +19,7 @@ class CommentServices:
     async def create_comment(
         comment_create: CommentCreate,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
         task_id: int | None = None,
         note_id: int | None = None,
     ) -> Comment:
@@ -33,39 +33,23 @@ class CommentServices:
                     "Comment can only be attached to either a task or note, not both"
                 )
 
-            # Проверяем существование задачи или заметки
-            if task_id:
-                task = await session.get(Task, task_id)
-                if not task:
-                    raise TaskNotFoundException()
-                if task.user_id != current_user.id:
-                    raise CommentAccessDeniedException()
-
-            if note_id:
-                note = await session.get(Note, note_id)
-                if not note:
-                    raise NoteNotFoundException()
-                if note.user_id != current_user.id:
-                    raise CommentAccessDeniedException()
-
-            comment = Comment(
+            # Владение родителем проверяется в том же INSERT ... SELECT
+            repository = CommentRepository(session, current_user.id)
+            comment = await repository.create_for_parent(
+                parent=Task if task_id else Note,
+                parent_id=task_id or note_id,
                 content=comment_create.content,
-                task_id=task_id,
-                note_id=note_id,
-                user_id=current_user.id,
             )
+            if comment is None:
+                raise TaskNotFoundException() if task_id else NoteNotFoundException()
 
-            session.add(comment)
             await session.commit()
-            await session.refresh(comment)
-
             return comment
 
         except (
             ValidationException,
             TaskNotFoundException,
             NoteNotFoundException,
-            CommentAccessDeniedException,
         ):
             await session.rollback()
             raise
@@ -77,56 +61,63 @@ class CommentServices:
     async def get_task_comments(
         task_id: int,
         session: AsyncSession,
-        current_user: User,
-    ) -> Sequence[Comment]:
-        task = await session.get(Task, task_id)
-        if not task:
-            raise TaskNotFoundException()
-        if task.user_id != current_user.id:
-            raise CommentAccessDeniedException()
-
-        stmt = (
-            select(Comment)
-            .where(Comment.task_id == task_id)
-            .order_by(Comment.created_at.asc())
+        current_user: User | UserClaims,
+        cursor: str | None = None,
+        limit: int = settings.pagination.default_page_size,
+    ) -> tuple[Sequence[Comment], str | None]:
+        repository = CommentRepository(session, current_user.id)
+        # Комментарии идут от старых к новым
+        comments, next_cursor = await paginate(
+            session,
+            repository.for_parent(Task, task_id),
+            order_by=Comment.created_at,
+            id=Comment.id,
+            cursor=cursor,
+            limit=limit,
+            descending=False,
         )
-        result: Result = await session.execute(stmt)
-        return result.scalars().all()
+        # Пустая страница: нет комментариев или родитель чужой/не существует
+        if not comments:
+            if not await TaskRepository(session, current_user.id).exists(task_id):
+                raise TaskNotFoundException()
+
+        return comments, next_cursor
 
     @staticmethod
     async def get_note_comments(
         note_id: int,
         session: AsyncSession,
-        current_user: User,
-    ) -> Sequence[Comment]:
-        note = await session.get(Note, note_id)
-        if not note:
-            raise NoteNotFoundException()
-        if note.user_id != current_user.id:
-            raise CommentAccessDeniedException()
-
-        stmt = (
-            select(Comment)
-            .where(Comment.note_id == note_id)
-            .order_by(Comment.created_at.asc())
+        current_user: User | UserClaims,
+        cursor: str | None = None,
+        limit: int = settings.pagination.default_page_size,
+    ) -> tuple[Sequence[Comment], str | None]:
+        repository = CommentRepository(session, current_user.id)
+        # Комментарии идут от старых к новым
+        comments, next_cursor = await paginate(
+            session,
+            repository.for_parent(Note, note_id),
+            order_by=Comment.created_at,
+            id=Comment.id,
+            cursor=cursor,
+            limit=limit,
+            descending=False,
         )
-        result: Result = await session.execute(stmt)
-        return result.scalars().all()
+        # Пустая страница: нет комментариев или родитель чужой/не существует
+        if not comments:
+            if not await NoteRepository(session, current_user.id).exists(note_id):
+                raise NoteNotFoundException()
+
+        return comments, next_cursor
 
     @staticmethod
     async def get_comment(
         comment_id: int,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
     ) -> Comment:
-        stmt = select(Comment).where(Comment.id == comment_id)
-        result: Result = await session.execute(stmt)
-        comment = result.scalar_one_or_none()
-
-        if not comment:
+        comment = await CommentRepository(session, current_user.id).get(comment_id)
+        if comment is None:
             raise CommentNotFoundException()
-        if comment.user_id != current_user.id:
-            raise CommentAccessDeniedException()
 
         return comment
 
@@ -135,25 +126,30 @@ class CommentServices:
         comment_id: int,
         comment_update: CommentUpdate,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
     ) -> Comment:
-        comment = await CommentServices.get_comment(comment_id, session, current_user)
+        values = comment_update.model_dump(exclude_unset=True)
+        if not values:
+            return await CommentServices.get_comment(comment_id, session, current_user)
 
-        for key, value in comment_update.model_dump(exclude_unset=True).items():
-            setattr(comment, key, value)
+        comment = await CommentRepository(session, current_user.id).update(
+            comment_id, values
+        )
+        if comment is None:
+            raise CommentNotFoundException()
 
         await session.commit()
-        await session.refresh(comment)
         return comment
 
     @staticmethod
     async def delete_comment(
         comment_id: int,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
     ) -> None:
-        comment = await CommentServices.get_comment(comment_id, session, current_user)
-        await session.delete(comment)
+        if not await CommentRepository(session, current_user.id).delete(comment_id):
+            raise CommentNotFoundException()
+
         await session.commit()
 
 
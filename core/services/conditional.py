@@ -0,0 +1,94 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Literal
+
+from fastapi import Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.models import user_change_versions_table
+
+
+ChangeKind = Literal["task", "note"]
+
+
+def representation_digest(request: Request) -> str:
+    # Разные ?fields=, фильтры и курсоры - разные представления
+    target = f"{request.url.path}?{request.url.query}".encode()
+    return hashlib.blake2b(target, digest_size=8).hexdigest()
+
+
+class ConditionalServices:
+    """Условные GET: ETag, Last-Modified и 304 до загрузки данных
+
+    Валидатор читается раньше данных. Если между ними что-то изменилось,
+    тело окажется новее ETag, и следующий опрос просто получит 200.
+    """
+
+    @staticmethod
+    async def list_etag(
+        session: AsyncSession,
+        user_id: int,
+        kind: ChangeKind,
+        request: Request,
+    ) -> str:
+        # Один поиск по первичному ключу вместо агрегатов по списку
+        versions = user_change_versions_table
+        version = await session.scalar(
+            select(versions.c.version).where(
+                versions.c.user_id == user_id, versions.c.kind == kind
+            )
+        )
+        return f'"{kind}-{version or 0}-{representation_digest(request)}"'
+
+    @staticmethod
+    def resource_etag(updated_at: datetime, request: Request) -> str:
+        # updated_at сдвигают и изменения комментариев ресурса
+        stamp = int(updated_at.timestamp() * 1_000_000)
+        return f'"{stamp}-{representation_digest(request)}"'
+
+    @staticmethod
+    def is_not_modified(
+        request: Request,
+        etag: str,
+        last_modified: datetime | None = None,
+    ) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-None-Match важнее If-Modified-Since; сравнение слабое
+            if if_none_match.strip() == "*":
+                return True
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return etag in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if last_modified is None or not if_modified_since:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP даты с точностью до секунды
+        return last_modified.replace(microsecond=0) <= since
+
+    @staticmethod
+    def headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                last_modified.astimezone(timezone.utc), usegmt=True
+            )
+        return headers
+
+    @staticmethod
+    def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=ConditionalServices.headers(etag, last_modified),
+        )
+
+
+conditional_services = ConditionalServices()
@@ -0,0 +1,165 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Literal, Sequence
+
+import orjson
+from sqlalchemy import RowMapping, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.models import Comment, Note, Task
+
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Выгружаемые колонки по типу записи
+EXPORT_COLUMNS = {
+    "task": (
+        Task,
+        [
+            Task.id,
+            Task.title,
+            Task.description,
+            Task.is_completed,
+            Task.comment_count,
+            Task.created_at,
+            Task.updated_at,
+        ],
+    ),
+    "note": (
+        Note,
+        [
+            Note.id,
+            Note.content,
+            Note.is_important,
+            Note.comment_count,
+            Note.created_at,
+            Note.updated_at,
+        ],
+    ),
+    "comment": (
+        Comment,
+        [
+            Comment.id,
+            Comment.content,
+            Comment.task_id,
+            Comment.note_id,
+            Comment.created_at,
+            Comment.updated_at,
+        ],
+    ),
+}
+
+# В CSV все типы в одной таблице: объединение колонок
+CSV_FIELDS = [
+    "type",
+    "id",
+    "title",
+    "description",
+    "content",
+    "is_completed",
+    "is_important",
+    "task_id",
+    "note_id",
+    "comment_count",
+    "created_at",
+    "updated_at",
+]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class ExportServices:
+    @staticmethod
+    async def rows(
+        session: AsyncSession,
+        user_id: int,
+        batch_size: int = settings.export.batch_size,
+    ) -> AsyncIterator[tuple[str, Sequence[RowMapping]]]:
+        for kind, (model, columns) in EXPORT_COLUMNS.items():
+            # Серверный курсор: в памяти не больше batch_size строк
+            stmt = (
+                select(*columns)
+                .where(model.user_id == user_id)
+                .order_by(model.id)
+                .execution_options(yield_per=batch_size)
+            )
+            result = await session.stream(stmt)
+            async for partition in result.mappings().partitions():
+                yield kind, partition
+
+    @staticmethod
+    def encode_ndjson(kind: str, rows: Sequence[RowMapping]) -> bytes:
+        return b"".join(
+            orjson.dumps({"type": kind, **row}, option=orjson.OPT_APPEND_NEWLINE)
+            for row in rows
+        )
+
+    @staticmethod
+    def encode_csv(kind: str, rows: Sequence[RowMapping]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, CSV_FIELDS, restval="")
+        for row in rows:
+            writer.writerow(
+                {
+                    "type": kind,
+                    **{
+                        key: value.isoformat() if isinstance(value, datetime) else value
+                        for key, value in row.items()
+                    },
+                }
+            )
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    async def stream(
+        session: AsyncSession,
+        user_id: int,
+        format: ExportFormat = "ndjson",
+        compress: bool = False,
+        batch_size: int = settings.export.batch_size,
+    ) -> AsyncIterator[bytes]:
+        """Выгрузка задач, заметок и комментариев пользователя кусками
+
+        Сессия принадлежит выгрузке и закрывается вместе с ней: ответ
+        отдается уже после выхода из зависимостей запроса.
+        """
+        encode = (
+            ExportServices.encode_csv
+            if format == "csv"
+            else ExportServices.encode_ndjson
+        )
+        # wbits=31 - формат gzip, сжатие идет по мере выгрузки
+        compressor = (
+            zlib.compressobj(settings.export.gzip_level, zlib.DEFLATED, 31)
+            if compress
+            else None
+        )
+
+        async with session:
+            # Задачи, заметки и комментарии читаются разными запросами:
+            # один снимок на всю выгрузку, чтобы они были согласованы
+            await session.connection(
+                execution_options={
+                    "isolation_level": "REPEATABLE READ",
+                    "postgresql_readonly": True,
+                }
+            )
+            if format == "csv":
+                header = (",".join(CSV_FIELDS) + "\r\n").encode()
+                yield compressor.compress(header) if compressor else header
+
+            async for kind, rows in ExportServices.rows(session, user_id, batch_size):
+                chunk = encode(kind, rows)
+                if compressor:
+                    chunk = compressor.compress(chunk)
+                if chunk:
+                    yield chunk
+
+        if compressor:
+            yield compressor.flush()
+
+
+export_services = ExportServices()
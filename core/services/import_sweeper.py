@@ -0,0 +1,87 @@
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import settings
+from core.services.imports import INTERRUPTED_ERROR
+
+
+log = logging.getLogger(__name__)
+
+STAGING_TABLES = ["import_staging_tasks", "import_staging_notes"]
+
+
+class ImportJobSweeper:
+    """Очистка импортов, прерванных падением процесса
+
+    Живой импорт продлевает аренду (updated_at) после каждой пачки и
+    перед слиянием. Задача в статусе running без прогресса дольше аренды
+    помечается failed, а ее строки удаляются из промежуточных таблиц.
+    Слияние держит блокировку строки задачи, поэтому SKIP LOCKED его
+    пропускает; опоздавший импорт сам остановится на следующей пачке.
+    """
+
+    def __init__(
+        self,
+        lease_seconds: float = 900,
+        interval_seconds: float = 300,
+        batch_size: int = 100,
+    ) -> None:
+        self.lease_seconds = lease_seconds
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+
+    async def sweep(self, engine: AsyncEngine) -> int:
+        swept = 0
+        while True:
+            async with engine.begin() as connection:
+                job_ids = (
+                    await connection.scalars(
+                        text(
+                            "UPDATE import_jobs SET status = 'failed', "
+                            "error = :error, updated_at = now(), finished_at = now() "
+                            "WHERE id IN (SELECT id FROM import_jobs "
+                            "WHERE status = 'running' "
+                            "AND updated_at < now() - make_interval(secs => :lease) "
+                            "ORDER BY updated_at LIMIT :limit "
+                            "FOR UPDATE SKIP LOCKED) "
+                            "RETURNING id"
+                        ),
+                        {
+                            "error": INTERRUPTED_ERROR,
+                            "lease": self.lease_seconds,
+                            "limit": self.batch_size,
+                        },
+                    )
+                ).all()
+                # В той же транзакции: строки задачи уходят вместе с ее статусом
+                for table in STAGING_TABLES if job_ids else []:
+                    await connection.execute(
+                        text(f"DELETE FROM {table} WHERE job_id = ANY(:job_ids)"),
+                        {"job_ids": list(job_ids)},
+                    )
+            swept += len(job_ids)
+            if len(job_ids) < self.batch_size:
+                break
+
+        if swept:
+            log.warning("Interrupted import jobs cleaned up: %d", swept)
+        return swept
+
+    async def run(self, engine: AsyncEngine) -> None:
+        while True:
+            try:
+                await self.sweep(engine)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Import job sweep failed")
+            await asyncio.sleep(self.interval_seconds)
+
+
+import_job_sweeper = ImportJobSweeper(
+    lease_seconds=settings.bulk_import.lease_seconds,
+    interval_seconds=settings.bulk_import.sweep_interval_seconds,
+)
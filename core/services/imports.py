@@ -0,0 +1,330 @@
+import codecs
+import csv
+import logging
+from typing import AsyncIterator, Literal, Sequence
+
+import orjson
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import Integer, Table, delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.exceptions.imports import ImportJobNotFoundException
+from core.models import (
+    ImportJob,
+    ImportJobError,
+    Note,
+    Task,
+    User,
+    import_staging_notes_table,
+    import_staging_tasks_table,
+)
+from core.schemas.notes import NoteCreate
+from core.schemas.tasks import TaskCreate
+from core.schemas.users import UserClaims
+from core.services.pagination import paginate
+
+
+log = logging.getLogger(__name__)
+
+ImportKind = Literal["task", "note"]
+ImportFormat = Literal["ndjson", "csv"]
+
+# Схема проверки, промежуточная таблица и целевая модель по типу
+IMPORT_KINDS: dict[str, tuple[type[BaseModel], Table, type]] = {
+    "task": (TaskCreate, import_staging_tasks_table, Task),
+    "note": (NoteCreate, import_staging_notes_table, Note),
+}
+
+# Номер строки и разобранная запись либо текст ошибки разбора
+ParsedRow = tuple[int, dict | None, str | None]
+
+# Ошибка задачи, которую признала прерванной очистка зависших импортов
+INTERRUPTED_ERROR = "Import interrupted"
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # Тело запроса приходит кусками: режем по строкам, не читая целиком
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def parse_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    number = 0
+    async for line in _lines(chunks):
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            yield number, orjson.loads(line), None
+        except orjson.JSONDecodeError as e:
+            yield number, None, f"Invalid JSON: {e}"
+
+
+async def parse_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    header = None
+    number = 0
+    start = 1
+    record: list[str] = []
+    async for line in _lines(chunks):
+        number += 1
+        record.append(line)
+        # Поле в кавычках может содержать перевод строки: ждем парную кавычку
+        if sum(part.count('"') for part in record) % 2:
+            continue
+
+        text = "".join(record)
+        record = []
+        line_start, start = start, number + 1
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = values
+            continue
+        if len(values) != len(header):
+            yield line_start, None, (
+                f"Expected {len(header)} columns, got {len(values)}"
+            )
+            continue
+        # Пустое поле - значение по умолчанию из схемы
+        yield line_start, {
+            key: value for key, value in zip(header, values) if value != ""
+        }, None
+
+    if record:
+        yield start, None, "Unterminated quoted field"
+
+
+PARSERS = {"ndjson": parse_ndjson, "csv": parse_csv}
+
+
+def validate_batch(
+    adapter: TypeAdapter, rows: list[tuple[int, dict]]
+) -> tuple[list[tuple[int, BaseModel]], list[tuple[int, str]]]:
+    """Проверка пачки строк одним вызовом pydantic
+
+    Если в пачке есть ошибки, они раскладываются по номерам строк,
+    а остальные строки проверяются повторно уже без них.
+    """
+    try:
+        models = adapter.validate_python([row for _, row in rows])
+        return [(line, model) for (line, _), model in zip(rows, models)], []
+    except ValidationError as e:
+        messages: dict[int, list[str]] = {}
+        for error in e.errors():
+            index, *loc = error["loc"]
+            field = ".".join(str(part) for part in loc)
+            messages.setdefault(index, []).append(
+                f"{field}: {error['msg']}" if field else error["msg"]
+            )
+
+    errors = [(rows[index][0], "; ".join(text)) for index, text in messages.items()]
+    valid = [row for index, row in enumerate(rows) if index not in messages]
+    models = adapter.validate_python([row for _, row in valid])
+    return [(line, model) for (line, _), model in zip(valid, models)], errors
+
+
+class ImportServices:
+    @staticmethod
+    async def _renew(session: AsyncSession, job_id: int, **values) -> None:
+        # Прогресс продлевает аренду. Задачу, уже признанную прерванной,
+        # не продолжаем: ее загруженные строки удалены
+        result = await session.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job_id, ImportJob.status == "running")
+            .values(updated_at=func.now(), **values)
+        )
+        if result.rowcount == 0:
+            raise RuntimeError(INTERRUPTED_ERROR)
+
+    @staticmethod
+    async def _copy(
+        session: AsyncSession,
+        table: Table,
+        job_id: int,
+        models: list[tuple[int, BaseModel]],
+    ) -> None:
+        columns = [column.name for column in table.columns]
+        fields = columns[2:]
+        records = [
+            (job_id, line, *(getattr(model, field) for field in fields))
+            for line, model in models
+        ]
+        # COPY в рамках транзакции сессии, минуя построчные INSERT
+        connection = await session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=columns
+        )
+
+    @staticmethod
+    async def _store_batch(
+        session: AsyncSession,
+        job: ImportJob,
+        table: Table,
+        adapter: TypeAdapter,
+        rows: list[tuple[int, dict]],
+        errors: list[tuple[int, str]],
+    ) -> None:
+        processed = len(rows) + len(errors)
+        valid, invalid = validate_batch(adapter, rows) if rows else ([], [])
+        errors = sorted(errors + invalid)
+        if valid:
+            await ImportServices._copy(session, table, job.id, valid)
+
+        # Храним только первые max_errors ошибок, счетчик - по всем
+        stored = min(len(errors), settings.bulk_import.max_errors - job.failed_rows)
+        if stored > 0:
+            await session.execute(
+                insert(ImportJobError),
+                [
+                    {"job_id": job.id, "line": line, "message": message}
+                    for line, message in errors[:stored]
+                ],
+            )
+
+        job.processed_rows += processed
+        job.failed_rows += len(errors)
+        await ImportServices._renew(
+            session,
+            job.id,
+            processed_rows=job.processed_rows,
+            failed_rows=job.failed_rows,
+        )
+        # Прогресс виден снаружи после каждой пачки
+        await session.commit()
+
+    @staticmethod
+    async def _merge(
+        session: AsyncSession,
+        job: ImportJob,
+        table: Table,
+        model: type,
+        user_id: int,
+    ) -> int:
+        # Сначала блокируем задачу: очистка зависших импортов ее пропустит
+        await ImportServices._renew(session, job.id)
+        # Одна вставка из промежуточной таблицы в порядке строк файла
+        fields = [column.name for column in table.columns][2:]
+        staged = (
+            select(*(table.c[field] for field in fields), literal(user_id, Integer))
+            .where(table.c.job_id == job.id)
+            .order_by(table.c.line)
+        )
+        result = await session.execute(
+            insert(model).from_select([*fields, "user_id"], staged)
+        )
+        await session.execute(delete(table).where(table.c.job_id == job.id))
+        return result.rowcount
+
+    @staticmethod
+    async def run_import(
+        chunks: AsyncIterator[bytes],
+        kind: ImportKind,
+        format: ImportFormat,
+        session: AsyncSession,
+        current_user: User | UserClaims,
+    ) -> ImportJob:
+        schema, table, model = IMPORT_KINDS[kind]
+        adapter = TypeAdapter(list[schema])
+        batch_size = settings.bulk_import.batch_size
+
+        job = ImportJob(kind=kind, format=format, user_id=current_user.id)
+        session.add(job)
+        await session.commit()
+        # После rollback атрибуты job истекают - id нужен заранее
+        job_id = job.id
+
+        try:
+            rows: list[tuple[int, dict]] = []
+            errors: list[tuple[int, str]] = []
+            async for line, row, error in PARSERS[format](chunks):
+                if error is not None:
+                    errors.append((line, error))
+                else:
+                    rows.append((line, row))
+                if len(rows) + len(errors) >= batch_size:
+                    await ImportServices._store_batch(
+                        session, job, table, adapter, rows, errors
+                    )
+                    rows, errors = [], []
+            await ImportServices._store_batch(
+                session, job, table, adapter, rows, errors
+            )
+
+            imported = await ImportServices._merge(
+                session, job, table, model, current_user.id
+            )
+            await session.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job.id)
+                .values(
+                    status="completed",
+                    imported_rows=imported,
+                    finished_at=func.now(),
+                )
+            )
+            await session.commit()
+
+        except Exception as e:
+            await session.rollback()
+            log.exception("Import job %d failed", job_id)
+            # Уже загруженные пачки не должны остаться в промежуточной таблице
+            await session.execute(delete(table).where(table.c.job_id == job_id))
+            await session.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job_id)
+                .values(status="failed", error=str(e), finished_at=func.now())
+            )
+            await session.commit()
+
+        await session.refresh(job)
+        return job
+
+    @staticmethod
+    async def get_job(
+        job_id: int,
+        session: AsyncSession,
+        current_user: User | UserClaims,
+    ) -> ImportJob:
+        job = await session.scalar(
+            select(ImportJob).where(
+                ImportJob.id == job_id, ImportJob.user_id == current_user.id
+            )
+        )
+        if job is None:
+            raise ImportJobNotFoundException()
+
+        return job
+
+    @staticmethod
+    async def get_errors(
+        job_id: int,
+        session: AsyncSession,
+        current_user: User | UserClaims,
+        cursor: str | None = None,
+        limit: int = settings.pagination.default_page_size,
+    ) -> tuple[Sequence[ImportJobError], str | None]:
+        await ImportServices.get_job(job_id, session, current_user)
+
+        return await paginate(
+            session,
+            select(ImportJobError).where(ImportJobError.job_id == job_id),
+            order_by=ImportJobError.line,
+            id=ImportJobError.id,
+            cursor=cursor,
+            limit=limit,
+            descending=False,
+        )
+
+
+import_services = ImportServices()
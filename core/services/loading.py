@@ -0,0 +1,92 @@
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import (
+    InstrumentedAttribute,
+    load_only,
+    raiseload,
+    selectinload,
+)
+
+from core.exceptions import ValidationException
+
+
+def response_columns(model: type, response_model: type[BaseModel]) -> list[str]:
+    """Колонки модели, которые реально попадают в ответ"""
+    columns = {attr.key for attr in inspect(model).column_attrs}
+    return [name for name in response_model.model_fields if name in columns]
+
+
+class ResponseShape:
+    """Какие колонки и связи загрузить под конкретный ответ
+
+    По умолчанию грузятся только поля response_model. ?fields=
+    сужает набор колонок, ?include= добавляет связи. Все остальное
+    не загружается, а случайное обращение к нему падает сразу,
+    а не уходит тихим lazy load запросом.
+    """
+
+    def __init__(
+        self,
+        model: type,
+        response_model: type[BaseModel],
+        relations: dict[str, tuple[InstrumentedAttribute, type[BaseModel]]],
+        fields: str | None = None,
+        include: str | None = None,
+    ) -> None:
+        self.model = model
+        self.relations = relations
+
+        allowed = response_columns(model, response_model)
+        if fields:
+            self.columns = [name.strip() for name in fields.split(",") if name.strip()]
+            unknown = set(self.columns) - set(allowed)
+            if unknown:
+                raise ValidationException(
+                    f"Unknown fields: {', '.join(sorted(unknown))}"
+                )
+        else:
+            self.columns = allowed
+
+        self.include = [
+            name.strip() for name in (include or "").split(",") if name.strip()
+        ]
+        unknown = set(self.include) - set(relations)
+        if unknown:
+            raise ValidationException(f"Unknown include: {', '.join(sorted(unknown))}")
+
+    def options(self, *required: InstrumentedAttribute) -> list:
+        # required - колонки, нужные самому сервису: id, владелец, ключ сортировки
+        columns = {getattr(self.model, name) for name in self.columns} | set(required)
+        options = [load_only(*columns, raiseload=True)]
+
+        for name in self.include:
+            relation, child_response = self.relations[name]
+            child = relation.property.mapper.class_
+            child_columns = {
+                getattr(child, column)
+                for column in response_columns(child, child_response)
+            }
+            # Внешний ключ нужен, чтобы разложить дочерние строки по родителям
+            child_columns |= {
+                getattr(child, column.key) for column in relation.property.remote_side
+            }
+            options.append(
+                selectinload(relation).load_only(*child_columns, raiseload=True)
+            )
+
+        options.append(raiseload("*"))
+        return options
+
+    def dump(self, obj: Any) -> dict:
+        # Только простые значения: результат сразу сериализуется orjson
+        data = {name: getattr(obj, name) for name in self.columns}
+        for name in self.include:
+            relation, child_response = self.relations[name]
+            columns = response_columns(relation.property.mapper.class_, child_response)
+            data[name] = [
+                {column: getattr(child, column) for column in columns}
+                for child in getattr(obj, name)
+            ]
+        return data
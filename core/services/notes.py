@@ -1,32 +1,38 @@
+from datetime import datetime
 from typing import Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, Result
-from sqlalchemy.orm import selectinload
 
+from core.config import settings
 from core.models import User
-from core.schemas.notes import NoteCreate, NoteUpdate
+from core.schemas.notes import NoteCreate, NoteFilters, NoteUpdate
+from core.repositories.notes import NoteRepository
+from core.schemas.users import UserClaims
+from core.services.loading import ResponseShape
+from core.services.pagination import paginate
 from core.models.notes import Note
-from core.exceptions.notes import NoteNotFoundException, NoteAccessDeniedException
+from core.exceptions.notes import NoteNotFoundException
 from core.exceptions import ValidationException
 
 
+# Белый список сортировок: пользовательский ввод не попадает в ORDER BY
+NOTE_SORT_FIELDS = {
+    "created_at": Note.created_at,
+    "updated_at": Note.updated_at,
+}
+
+
 class NoteServices:
     @staticmethod
     async def create_note(
         note_create: NoteCreate,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
     ) -> Note:
         try:
-            note = Note(
-                **note_create.model_dump(),
-                user_id=current_user.id,
-            )
-
-            session.add(note)
+            repository = NoteRepository(session, current_user.id)
+            note = await repository.create(note_create.model_dump())
             await session.commit()
-            await session.refresh(note)
             return note
 
         except Exception:
@@ -37,58 +43,93 @@ class NoteServices:
     async def get_note(
         note_id: int,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
+        shape: ResponseShape | None = None,
     ) -> Note:
-        stmt = (
-            select(Note).options(selectinload(Note.comments)).where(Note.id == note_id)
-        )
-        result: Result = await session.execute(stmt)
-        note = result.scalar_one_or_none()
-
-        if not note:
+        options = shape.options(Note.id) if shape is not None else ()
+        note = await NoteRepository(session, current_user.id).get(note_id, *options)
+        if note is None:
             raise NoteNotFoundException()
-        if note.user_id != current_user.id:
-            raise NoteAccessDeniedException()
 
         return note
 
+    @staticmethod
+    async def get_note_last_modified(
+        note_id: int,
+        session: AsyncSession,
+        current_user: User | UserClaims,
+    ) -> datetime:
+        updated_at = await NoteRepository(session, current_user.id).last_modified(
+            note_id
+        )
+        if updated_at is None:
+            raise NoteNotFoundException()
+
+        return updated_at
+
     @staticmethod
     async def get_all_notes(
         session: AsyncSession,
-        current_user: User,
-    ) -> Sequence[Note]:
-        stmt = (
-            select(Note)
-            .where(Note.user_id == current_user.id)
-            .order_by(Note.created_at.desc())
+        current_user: User | UserClaims,
+        filters: NoteFilters | None = None,
+        shape: ResponseShape | None = None,
+        cursor: str | None = None,
+        limit: int = settings.pagination.default_page_size,
+    ) -> tuple[Sequence[Note], str | None]:
+        filters = filters or NoteFilters()
+        order_by = NOTE_SORT_FIELDS[filters.sort.lstrip("-")]
+        # Ключ сортировки нужен для курсора, даже если его нет в ?fields=
+        options = shape.options(Note.id, order_by) if shape is not None else ()
+        stmt = NoteRepository(session, current_user.id).select(*options)
+
+        if filters.is_important is not None:
+            stmt = stmt.where(Note.is_important == filters.is_important)
+        if filters.created_after:
+            stmt = stmt.where(Note.created_at >= filters.created_after)
+        if filters.created_before:
+            stmt = stmt.where(Note.created_at < filters.created_before)
+        if filters.updated_after:
+            stmt = stmt.where(Note.updated_at >= filters.updated_after)
+        if filters.updated_before:
+            stmt = stmt.where(Note.updated_at < filters.updated_before)
+
+        return await paginate(
+            session,
+            stmt,
+            order_by=order_by,
+            id=Note.id,
+            cursor=cursor,
+            limit=limit,
+            descending=filters.sort.startswith("-"),
         )
-        result: Result = await session.execute(stmt)
-        return result.scalars().all()
 
     @staticmethod
     async def update_note(
         note_id: int,
         data: NoteUpdate,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
     ) -> Note:
-        note = await NoteServices.get_note(note_id, session, current_user)
+        values = data.model_dump(exclude_unset=True)
+        if not values:
+            return await NoteServices.get_note(note_id, session, current_user)
 
-        for key, value in data.model_dump(exclude_unset=True).items():
-            setattr(note, key, value)
+        note = await NoteRepository(session, current_user.id).update(note_id, values)
+        if note is None:
+            raise NoteNotFoundException()
 
         await session.commit()
-        await session.refresh(note)
         return note
 
     @staticmethod
     async def delete_note(
         note_id: int,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
     ) -> None:
-        note = await NoteServices.get_note(note_id, session, current_user)
-        await session.delete(note)
+        if not await NoteRepository(session, current_user.id).delete(note_id):
+            raise NoteNotFoundException()
+
         await session.commit()
 
 
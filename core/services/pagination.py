@@ -0,0 +1,88 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from core.exceptions import ValidationException
+
+
+def pack_cursor(*values: Any) -> str:
+    values = [
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ]
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def unpack_cursor(cursor: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        raise ValidationException("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValidationException("Invalid cursor")
+    return values
+
+
+def encode_cursor(key: str, value: Any, id: int) -> str:
+    return pack_cursor(key, value, id)
+
+
+def decode_cursor(cursor: str, order_by: InstrumentedAttribute) -> tuple[Any, int]:
+    try:
+        key, value, id = unpack_cursor(cursor)
+        # Курсор действителен только для той же сортировки
+        if key != order_by.key or not isinstance(id, int):
+            raise ValueError(key)
+        if order_by.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, order_by.type.python_type):
+            raise ValueError(value)
+        return value, id
+    except (ValueError, TypeError):
+        raise ValidationException("Invalid cursor")
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    order_by: InstrumentedAttribute,
+    id: InstrumentedAttribute,
+    cursor: str | None,
+    limit: int,
+    descending: bool = True,
+) -> tuple[Sequence[Any], str | None]:
+    """Keyset пагинация по (order_by, id)
+
+    Вместо OFFSET продолжаем с последней выданной строки, поэтому
+    стоимость страницы не растет с глубиной прокрутки. Для каждой
+    сортировки есть индекс (user_id, order_by, id) или аналогичный.
+    """
+    key = tuple_(order_by, id)
+    if cursor is not None:
+        position = tuple_(*decode_cursor(cursor, order_by))
+        stmt = stmt.where(key < position if descending else key > position)
+
+    if descending:
+        stmt = stmt.order_by(order_by.desc(), id.desc())
+    else:
+        stmt = stmt.order_by(order_by.asc(), id.asc())
+
+    # Лишняя строка показывает, есть ли следующая страница
+    result = await session.execute(stmt.limit(limit + 1))
+    items = result.scalars().all()
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(
+        order_by.key,
+        getattr(last, order_by.key),
+        getattr(last, id.key),
+    )
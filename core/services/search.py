@@ -0,0 +1,127 @@
+from typing import Literal, Sequence
+
+from sqlalchemy import (
+    Row,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.exceptions import ValidationException
+from core.models import Comment, Note, Task, User
+from core.models.search import SEARCH_CONFIG
+from core.schemas.users import UserClaims
+from core.services.pagination import pack_cursor, unpack_cursor
+
+
+SearchKind = Literal["task", "note", "comment"]
+
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=5, FragmentDelimiter=' … '"
+
+
+class SearchServices:
+    @staticmethod
+    async def search(
+        query: str,
+        session: AsyncSession,
+        current_user: User | UserClaims,
+        kinds: Sequence[SearchKind] = ("task", "note", "comment"),
+        cursor: str | None = None,
+        limit: int = settings.pagination.default_page_size,
+    ) -> tuple[Sequence[Row], str | None]:
+        config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+        # Разбираем запрос один раз: "слово", -исключение, "точная фраза", or
+        tsquery = select(func.websearch_to_tsquery(config, query).label("q")).cte(
+            "tsquery"
+        )
+
+        # Кандидаты из каждой таблицы: GIN индекс + фильтр по владельцу
+        branches = []
+        for kind, model in (("task", Task), ("note", Note), ("comment", Comment)):
+            if kind not in kinds:
+                continue
+            branches.append(
+                select(
+                    literal(kind).label("kind"),
+                    model.id.label("id"),
+                    model.created_at.label("created_at"),
+                    func.ts_rank_cd(model.search_vector, tsquery.c.q).label("rank"),
+                )
+                .select_from(model)
+                .join(tsquery, true())
+                .where(
+                    model.user_id == current_user.id,
+                    model.search_vector.bool_op("@@")(tsquery.c.q),
+                )
+            )
+        matches = union_all(*branches).subquery("matches")
+
+        # Keyset по (rank, kind, id): ранг не уникален, kind и id делают порядок полным
+        key = tuple_(matches.c.rank, matches.c.kind, matches.c.id)
+        page_stmt = select(matches)
+        if cursor is not None:
+            rank, kind, id = SearchServices._decode_cursor(cursor)
+            page_stmt = page_stmt.where(key < tuple_(rank, kind, id))
+        page = (
+            page_stmt.order_by(
+                matches.c.rank.desc(), matches.c.kind.desc(), matches.c.id.desc()
+            )
+            .limit(limit + 1)
+            .cte("page")
+        )
+
+        # ts_headline дорогой - считаем его только для строк страницы
+        document = func.coalesce(
+            Task.title + " " + func.coalesce(Task.description, ""),
+            Note.content,
+            Comment.content,
+        )
+        stmt = (
+            select(
+                page.c.kind,
+                page.c.id,
+                page.c.rank,
+                page.c.created_at,
+                func.ts_headline(config, document, tsquery.c.q, HEADLINE_OPTIONS).label(
+                    "snippet"
+                ),
+            )
+            .select_from(
+                page.outerjoin(Task, (page.c.kind == "task") & (Task.id == page.c.id))
+                .outerjoin(Note, (page.c.kind == "note") & (Note.id == page.c.id))
+                .outerjoin(
+                    Comment, (page.c.kind == "comment") & (Comment.id == page.c.id)
+                )
+            )
+            .join(tsquery, true())
+            .order_by(page.c.rank.desc(), page.c.kind.desc(), page.c.id.desc())
+        )
+
+        rows = (await session.execute(stmt)).all()
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, pack_cursor(last.rank, last.kind, last.id)
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[float, str, int]:
+        values = unpack_cursor(cursor)
+        if (
+            len(values) != 3
+            or not isinstance(values[0], (int, float))
+            or values[1] not in ("task", "note", "comment")
+            or not isinstance(values[2], int)
+        ):
+            raise ValidationException("Invalid cursor")
+        return float(values[0]), values[1], values[2]
+
+
+search_services = SearchServices()
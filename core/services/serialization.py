@@ -0,0 +1,39 @@
+from typing import Any, Iterable, Mapping
+
+import orjson
+from fastapi import responses
+
+
+class ORJSONResponse(responses.ORJSONResponse):
+    """orjson с тем же форматом дат, что и у pydantic: UTC как "Z" """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> ORJSONResponse:
+    """Ответ из уже подготовленных данных
+
+    Если маршрут возвращает Response, FastAPI не прогоняет результат
+    через response_model и jsonable_encoder: словари, собранные по
+    колонкам схемы, сразу уходят в orjson. response_model остается
+    в декораторе ради OpenAPI.
+    """
+    return ORJSONResponse(content, status_code=status_code, headers=headers)
+
+
+def page_response(
+    items: Iterable[Mapping[str, Any]],
+    next_cursor: str | None,
+    headers: Mapping[str, str] | None = None,
+) -> ORJSONResponse:
+    return json_response(
+        {"items": list(items), "next_cursor": next_cursor}, headers=headers
+    )
@@ -1,32 +1,47 @@
+from datetime import datetime
 from typing import Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, Result
-from sqlalchemy.orm import selectinload
 
+from core.config import settings
 from core.models import User
-from core.schemas.tasks import TaskCreate, TaskUpdate
+from core.schemas.tasks import (
+    TaskFilters,
+    TaskCreate,
+    TaskUpdate,
+    TaskBatchCreate,
+    TaskBatchUpdate,
+    TaskBatchDelete,
+    TaskBatchItemResult,
+)
+from core.repositories.tasks import TaskRepository
+from core.schemas.users import UserClaims
+from core.services.loading import ResponseShape
+from core.services.pagination import paginate
 from core.models.tasks import Task
-from core.exceptions.tasks import TaskNotFoundException, TaskAccessDeniedException
+from core.exceptions.tasks import TaskNotFoundException
 from core.exceptions import ValidationException
 
 
+# Белый список сортировок: пользовательский ввод не попадает в ORDER BY
+TASK_SORT_FIELDS = {
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+    "title": Task.title,
+}
+
+
 class TaskServices:
     @staticmethod
     async def create_task(
         task_create: TaskCreate,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
     ) -> Task:
         try:
-            task = Task(
-                **task_create.model_dump(),
-                user_id=current_user.id,
-            )
-
-            session.add(task)
+            repository = TaskRepository(session, current_user.id)
+            task = await repository.create(task_create.model_dump())
             await session.commit()
-            await session.refresh(task)
             return task
 
         except Exception:
@@ -37,59 +52,170 @@ class TaskServices:
     async def get_task(
         task_id: int,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
+        shape: ResponseShape | None = None,
     ) -> Task:
-        stmt = (
-            select(Task).options(selectinload(Task.comments)).where(Task.id == task_id)
-        )
-        result: Result = await session.execute(stmt)
-        task = result.scalar_one_or_none()
-
-        if not task:
+        options = shape.options(Task.id) if shape is not None else ()
+        task = await TaskRepository(session, current_user.id).get(task_id, *options)
+        if task is None:
             raise TaskNotFoundException()
-        if task.user_id != current_user.id:
-            raise TaskAccessDeniedException()
 
         return task
 
+    @staticmethod
+    async def get_task_last_modified(
+        task_id: int,
+        session: AsyncSession,
+        current_user: User | UserClaims,
+    ) -> datetime:
+        updated_at = await TaskRepository(session, current_user.id).last_modified(
+            task_id
+        )
+        if updated_at is None:
+            raise TaskNotFoundException()
+
+        return updated_at
+
     @staticmethod
     async def get_all_tasks(
         session: AsyncSession,
-        current_user: User,
-    ) -> Sequence[Task]:
-        stmt = (
-            select(Task)
-            .where(Task.user_id == current_user.id)
-            .order_by(Task.created_at.desc())
+        current_user: User | UserClaims,
+        filters: TaskFilters | None = None,
+        shape: ResponseShape | None = None,
+        cursor: str | None = None,
+        limit: int = settings.pagination.default_page_size,
+    ) -> tuple[Sequence[Task], str | None]:
+        filters = filters or TaskFilters()
+        order_by = TASK_SORT_FIELDS[filters.sort.lstrip("-")]
+        # Ключ сортировки нужен для курсора, даже если его нет в ?fields=
+        options = shape.options(Task.id, order_by) if shape is not None else ()
+        stmt = TaskRepository(session, current_user.id).select(*options)
+
+        if filters.is_completed is not None:
+            stmt = stmt.where(Task.is_completed == filters.is_completed)
+        if filters.title_prefix:
+            stmt = stmt.where(
+                Task.title.startswith(filters.title_prefix, autoescape=True)
+            )
+        if filters.created_after:
+            stmt = stmt.where(Task.created_at >= filters.created_after)
+        if filters.created_before:
+            stmt = stmt.where(Task.created_at < filters.created_before)
+        if filters.updated_after:
+            stmt = stmt.where(Task.updated_at >= filters.updated_after)
+        if filters.updated_before:
+            stmt = stmt.where(Task.updated_at < filters.updated_before)
+
+        return await paginate(
+            session,
+            stmt,
+            order_by=order_by,
+            id=Task.id,
+            cursor=cursor,
+            limit=limit,
+            descending=filters.sort.startswith("-"),
         )
-        result: Result = await session.execute(stmt)
-        return result.scalars().all()
 
     @staticmethod
     async def update_task(
         task_id: int,
         data: TaskUpdate,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
     ) -> Task:
-        task = await TaskServices.get_task(task_id, session, current_user)
+        values = data.model_dump(exclude_unset=True)
+        if not values:
+            return await TaskServices.get_task(task_id, session, current_user)
 
-        for key, value in data.model_dump(exclude_unset=True).items():
-            setattr(task, key, value)
+        task = await TaskRepository(session, current_user.id).update(task_id, values)
+        if task is None:
+            raise TaskNotFoundException()
 
         await session.commit()
-        await session.refresh(task)
         return task
 
     @staticmethod
     async def delete_task(
         task_id: int,
         session: AsyncSession,
-        current_user: User,
+        current_user: User | UserClaims,
     ) -> None:
-        task = await TaskServices.get_task(task_id, session, current_user)
-        await session.delete(task)
+        if not await TaskRepository(session, current_user.id).delete(task_id):
+            raise TaskNotFoundException()
+
         await session.commit()
 
+    @staticmethod
+    async def create_tasks(
+        data: TaskBatchCreate,
+        session: AsyncSession,
+        current_user: User | UserClaims,
+    ) -> list[TaskBatchItemResult]:
+        repository = TaskRepository(session, current_user.id)
+        try:
+            tasks = await repository.create_many(
+                [item.model_dump() for item in data.items]
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise ValidationException("Task creation failed. Please try again")
+
+        return [
+            TaskBatchItemResult(id=task.id, status="created", task=task)
+            for task in tasks
+        ]
+
+    @staticmethod
+    async def update_tasks(
+        data: TaskBatchUpdate,
+        session: AsyncSession,
+        current_user: User | UserClaims,
+    ) -> list[TaskBatchItemResult]:
+        values = data.data.model_dump(exclude_unset=True)
+        if not values:
+            raise ValidationException("No fields to update")
+
+        repository = TaskRepository(session, current_user.id)
+        try:
+            tasks = await repository.update_many(data.ids, values)
+            updated = {task.id: task for task in tasks}
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise ValidationException("Task update failed. Please try again")
+
+        # Чужие и несуществующие задачи неотличимы: обе not_found
+        return [
+            (
+                TaskBatchItemResult(id=task_id, status="updated", task=updated[task_id])
+                if task_id in updated
+                else TaskBatchItemResult(id=task_id, status="not_found")
+            )
+            for task_id in data.ids
+        ]
+
+    @staticmethod
+    async def delete_tasks(
+        data: TaskBatchDelete,
+        session: AsyncSession,
+        current_user: User | UserClaims,
+    ) -> list[TaskBatchItemResult]:
+        repository = TaskRepository(session, current_user.id)
+        try:
+            deleted = await repository.delete_many(data.ids)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise ValidationException("Task deletion failed. Please try again")
+
+        return [
+            TaskBatchItemResult(
+                id=task_id,
+                status="deleted" if task_id in deleted else "not_found",
+            )
+            for task_id in data.ids
+        ]
+
 
 task_services = TaskServices()
@@ -1,8 +1,16 @@
+import secrets
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, Result
+from sqlalchemy import select, update, text, Result
 
+from auth.revocation import revocation_index
+from auth.user_cache import user_identity_cache
+from core.exceptions.users import AccountDeletionNotFoundException
 from core.schemas.users import UserUpdate
-from core.models import User
+from core.models import User, AccountDeletion
+from core.models.account_deletions import ACTIVE_DELETION_STATUSES
+from core.services.account_deletion import account_deletion_worker
 
 
 class UserService:
@@ -25,8 +33,9 @@ class UserService:
             for key, value in data.model_dump(exclude_unset=True).items():
                 setattr(user, key, value)
 
+            # У users нет серверных значений при UPDATE - перечитывать нечего
             await session.commit()
-            await session.refresh(user)
+            user_identity_cache.invalidate(user.id)
             return user
 
         except Exception:
@@ -37,13 +46,58 @@ class UserService:
     async def delete_user_account(
         user: User,
         session: AsyncSession,
-    ) -> None:
+    ) -> AccountDeletion:
         try:
-            await session.delete(user)
+            # Сразу деактивируем и отзываем все токены, данные удаляет воркер
+            stmt = (
+                update(User)
+                .where(User.id == user.id)
+                .values(is_active=False, token_generation=User.token_generation + 1)
+                .returning(User.token_generation)
+            )
+            generation = (await session.execute(stmt)).scalar_one()
+            await revocation_index.publish_generation(session, user.id, generation)
+
+            # Повторный запрос возвращает уже поставленную задачу
+            stmt = (
+                pg_insert(AccountDeletion)
+                .values(token=secrets.token_urlsafe(32), user_id=user.id)
+                .on_conflict_do_nothing(
+                    index_elements=[AccountDeletion.user_id],
+                    index_where=text("status IN ('pending', 'running')"),
+                )
+                .returning(AccountDeletion)
+            )
+            deletion = (await session.execute(stmt)).scalar_one_or_none()
+            if deletion is None:
+                deletion = await session.scalar(
+                    select(AccountDeletion).where(
+                        AccountDeletion.user_id == user.id,
+                        AccountDeletion.status.in_(ACTIVE_DELETION_STATUSES),
+                    )
+                )
+
             await session.commit()
+            user_identity_cache.invalidate(user.id)
+            account_deletion_worker.wake()
+            return deletion
+
         except Exception:
             await session.rollback()
             raise
 
+    @staticmethod
+    async def get_account_deletion(
+        token: str,
+        session: AsyncSession,
+    ) -> AccountDeletion:
+        deletion = await session.scalar(
+            select(AccountDeletion).where(AccountDeletion.token == token)
+        )
+        if deletion is None:
+            raise AccountDeletionNotFoundException()
+
+        return deletion
+
 
 user_services = UserService()
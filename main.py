@@ -1,15 +1,86 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
+from auth.hashing import password_hashing_pool
+from auth.keyring import keyring
+from auth.retention import refresh_token_partitions
+from auth.revocation import revocation_index
+from auth.stats import stats_reporter
+from core.services.account_deletion import account_deletion_worker
+from core.services.import_sweeper import import_job_sweeper
+from core.services.comment_counts import comment_counts_repair
+from core.config import settings
+from core.models.db_helper import db_helper
 from core.routers.users import router as users_router
 from core.routers.auth import router as auth_router
+from core.routers.tasks import router as tasks_router
+from core.routers.notes import router as notes_router
+from core.routers.comments import router as comments_router
+from core.routers.search import router as search_router
+from core.routers.export import router as export_router
+from core.routers.imports import router as imports_router
+from core.services.serialization import ORJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Ключи JWT разбираем один раз при старте
+    keyring.load()
+    password_hashing_pool.start()
+    if settings.hashing.rounds is None:
+        await password_hashing_pool.calibrate(
+            target_ms=settings.hashing.target_ms,
+            min_rounds=settings.hashing.min_rounds,
+            max_rounds=settings.hashing.max_rounds,
+        )
+    # Индекс отозванных refresh токенов: загрузка и LISTEN в фоне
+    revocation_task = asyncio.create_task(revocation_index.run(db_helper.engine))
+    # Секции refresh_tokens должны существовать до первого логина
+    await refresh_token_partitions.maintain(db_helper.engine)
+    partitions_task = asyncio.create_task(
+        refresh_token_partitions.run(db_helper.engine)
+    )
+    # Отставание реплик: отстающие исключаются из чтения
+    replicas_task = asyncio.create_task(db_helper.monitor_replicas())
+    # Периодическая сверка денормализованных счетчиков комментариев
+    comment_counts_task = asyncio.create_task(
+        comment_counts_repair.run(db_helper.engine)
+    )
+    # Удаление аккаунтов порциями; подхватывает задачи, прерванные рестартом
+    account_deletion_task = asyncio.create_task(
+        account_deletion_worker.run(db_helper.engine)
+    )
+    # Импорты, прерванные падением процесса: статус и промежуточные строки
+    import_sweeper_task = asyncio.create_task(import_job_sweeper.run(db_helper.engine))
+    # Метрики пула bcrypt и кэша проверенных токенов в лог
+    stats_task = asyncio.create_task(stats_reporter.run())
+    yield
+    stats_task.cancel()
+    import_sweeper_task.cancel()
+    account_deletion_task.cancel()
+    comment_counts_task.cancel()
+    replicas_task.cancel()
+    partitions_task.cancel()
+    revocation_task.cancel()
+    password_hashing_pool.shutdown()
+    await db_helper.dispose()
 
 
-app = FastAPI()
+# orjson для всех ответов, включая прошедшие через response_model
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 
 app.include_router(users_router)
 app.include_router(auth_router)
+app.include_router(tasks_router)
+app.include_router(notes_router)
+app.include_router(comments_router)
+app.include_router(search_router)
+app.include_router(export_router)
+app.include_router(imports_router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+"""Проверка памяти потоковой выгрузки на локальной БД
+
+Создает тестового пользователя и наращивает его задачи, заметки и
+комментарии до каждого из указанных размеров, после каждого шага
+выгружает все данные через ExportServices.stream и печатает время,
+объем ответа и пик памяти Python (tracemalloc). Пик не должен расти
+вместе с числом строк. Тестовый пользователь удаляется в конце.
+
+    python -m scripts.bench_export [rows ...]
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from core.config import settings
+from core.services.export import export_services
+
+
+USERNAME = "export_bench"
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO tasks (title, description, is_completed, user_id,
+                       created_at, updated_at)
+    SELECT 'task ' || g, repeat(md5(g::text), 4), g % 2 = 0, :user_id,
+           now() - g * interval '1 second', now()
+    FROM generate_series(:start, :stop) g
+    """,
+    """
+    INSERT INTO notes (content, is_important, user_id, created_at, updated_at)
+    SELECT repeat(md5(g::text), 4), g % 3 = 0, :user_id,
+           now() - g * interval '1 second', now()
+    FROM generate_series(:start, :stop) g
+    """,
+    """
+    INSERT INTO comments (content, user_id, task_id, created_at, updated_at)
+    SELECT md5(t.id::text), :user_id, t.id, t.created_at, now()
+    FROM tasks t
+    WHERE t.user_id = :user_id
+    ORDER BY t.id DESC
+    LIMIT :stop - :start + 1
+    """,
+]
+
+
+async def measure(engine, user_id: int, format: str, compress: bool) -> None:
+    size = 0
+    tracemalloc.start()
+    started = time.perf_counter()
+    async for chunk in export_services.stream(
+        session=AsyncSession(engine),
+        user_id=user_id,
+        format=format,
+        compress=compress,
+    ):
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    label = f"{format}{'+gzip' if compress else ''}"
+    print(
+        f"{'':>10}{label:<12}{elapsed:>8.2f}s"
+        f"{size / 2**20:>10.1f} MiB{peak / 2**20:>10.2f} MiB peak"
+    )
+
+
+async def main(sizes: list[int]) -> None:
+    engine = create_async_engine(str(settings.db.url))
+    async with engine.begin() as connection:
+        await connection.execute(
+            text("DELETE FROM users WHERE username = :username"),
+            {"username": USERNAME},
+        )
+        user_id = await connection.scalar(
+            text(
+                "INSERT INTO users (email, username, hashed_password, "
+                "is_active, is_superuser, is_verified) "
+                "VALUES (:username || '@example.com', :username, 'x', "
+                "true, false, false) RETURNING id"
+            ),
+            {"username": USERNAME},
+        )
+
+    try:
+        seeded = 0
+        for rows in sorted(sizes):
+            # Выгрузка идет в своей сессии - данные должны быть закоммичены
+            async with engine.begin() as connection:
+                for statement in SEED_STATEMENTS:
+                    await connection.execute(
+                        text(statement),
+                        {"user_id": user_id, "start": seeded + 1, "stop": rows},
+                    )
+            seeded = rows
+            print(f"{rows:>10} rows per table")
+            for format in ("ndjson", "csv"):
+                for compress in (False, True):
+                    await measure(engine, user_id, format, compress)
+    finally:
+        # Дочерние строки удаляет ON DELETE CASCADE
+        async with engine.begin() as connection:
+            await connection.execute(
+                text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id}
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    asyncio.run(main(sizes))
@@ -0,0 +1,61 @@
+"""Сравнение скорости подписи и проверки JWT для разных алгоритмов
+
+    python -m scripts.bench_jwt [iterations]
+"""
+
+import sys
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from auth.jwt_manager import JwtManager
+from auth.keyring import KeyRing
+
+
+PAYLOAD = {
+    "sub": "42",
+    "username": "bench",
+    "email": "bench@example.com",
+    "jti": "00000000-0000-0000-0000-000000000000",
+}
+
+
+def make_manager(algorithm: str) -> JwtManager:
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+
+    keys = KeyRing()
+    keys.add_key(algorithm.lower(), private_key)
+    return JwtManager(keys)
+
+
+def bench(algorithm: str, iterations: int) -> tuple[float, float]:
+    manager = make_manager(algorithm)
+
+    started = time.perf_counter()
+    tokens = [manager.create_access_token(PAYLOAD) for _ in range(iterations)]
+    sign_rate = iterations / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for token in tokens:
+        manager.verify_access_token(token)
+    verify_rate = iterations / (time.perf_counter() - started)
+
+    return sign_rate, verify_rate
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print(f"{'algorithm':<10} {'sign/s':>12} {'verify/s':>12}")
+    for algorithm in ("RS256", "ES256", "EdDSA"):
+        sign_rate, verify_rate = bench(algorithm, iterations)
+        print(f"{algorithm:<10} {sign_rate:>12,.0f} {verify_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
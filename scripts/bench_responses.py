@@ -0,0 +1,152 @@
+"""Сравнение сериализации списков: response_model против готовых словарей
+
+Без БД: строит N задач (с комментариями) и N комментариев в памяти и
+для каждого списка измеряет прежний путь - проверка через response_model,
+jsonable-сериализация FastAPI и stdlib json в JSONResponse - и новый:
+словари по колонкам схемы сразу в ORJSONResponse.
+
+    python -m scripts.bench_responses [items] [iterations]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from core.dependencies.comments import comment_shape
+from core.dependencies.tasks import task_shape
+from core.models import Comment, Task
+from core.schemas.comments import CommentResponse
+from core.schemas.pagination import Page
+from core.schemas.tasks import TaskSparseResponse
+from core.services.serialization import page_response
+
+
+def make_tasks(count: int, comments_per_task: int) -> list[Task]:
+    now = datetime.now(timezone.utc)
+    tasks = []
+    for i in range(count):
+        created = now - timedelta(seconds=i)
+        task = Task(
+            id=i,
+            title=f"task {i}",
+            description="description " * 8,
+            is_completed=i % 2 == 0,
+            comment_count=comments_per_task,
+            created_at=created,
+            updated_at=created,
+            user_id=1,
+        )
+        task.comments = make_comments(comments_per_task, start=i * comments_per_task)
+        tasks.append(task)
+    return tasks
+
+
+def make_comments(count: int, start: int = 0) -> list[Comment]:
+    now = datetime.now(timezone.utc)
+    return [
+        Comment(
+            id=start + i,
+            content="comment " * 6,
+            created_at=now,
+            updated_at=now,
+            user_id=1,
+        )
+        for i in range(count)
+    ]
+
+
+async def before(field, items: list, exclude_unset: bool) -> bytes:
+    content = await serialize_response(
+        field=field,
+        response_content={"items": items, "next_cursor": None},
+        exclude_unset=exclude_unset,
+    )
+    return JSONResponse(content).body
+
+
+def after(items) -> bytes:
+    return page_response(items, None).body
+
+
+async def measure(label: str, run_before, run_after, iterations: int) -> None:
+    timings = {"before": [], "after": []}
+    sizes = {}
+    for _ in range(iterations):
+        for name, run in (("before", run_before), ("after", run_after)):
+            started = time.perf_counter()
+            body = await run()
+            timings[name].append((time.perf_counter() - started) * 1000)
+            sizes[name] = len(body)
+
+    before_ms = statistics.median(timings["before"])
+    after_ms = statistics.median(timings["after"])
+    print(
+        f"{label:<24}{before_ms:>12.1f}{after_ms:>12.1f}"
+        f"{before_ms / after_ms:>9.1f}x{sizes['after'] / 2**20:>10.1f} MiB"
+    )
+
+
+async def main(count: int, iterations: int) -> None:
+    tasks = make_tasks(count, comments_per_task=2)
+    comments = make_comments(count)
+    tasks_field = create_model_field(
+        "Response_get_all_tasks", Page[TaskSparseResponse], mode="serialization"
+    )
+    comments_field = create_model_field(
+        "Response_get_comments", Page[CommentResponse], mode="serialization"
+    )
+
+    shape = task_shape()
+    include_shape = task_shape(include="comments")
+    comments_shape = comment_shape()
+
+    async def tasks_before():
+        # Прежний ResponseShape.dump отдавал дочерние строки моделями pydantic
+        items = [
+            {name: getattr(task, name) for name in shape.columns} for task in tasks
+        ]
+        return await before(tasks_field, items, exclude_unset=True)
+
+    async def tasks_after():
+        return after(shape.dump(task) for task in tasks)
+
+    async def include_before():
+        items = [
+            {
+                **{name: getattr(task, name) for name in include_shape.columns},
+                "comments": [
+                    CommentResponse.model_validate(comment) for comment in task.comments
+                ],
+            }
+            for task in tasks
+        ]
+        return await before(tasks_field, items, exclude_unset=True)
+
+    async def include_after():
+        return after(include_shape.dump(task) for task in tasks)
+
+    async def comments_before():
+        return await before(comments_field, comments, exclude_unset=False)
+
+    async def comments_after():
+        return after(comments_shape.dump(comment) for comment in comments)
+
+    print(f"{count} items, median of {iterations} runs")
+    print(
+        f"{'endpoint':<24}{'before ms':>12}{'after ms':>12}{'speedup':>10}{'body':>14}"
+    )
+    await measure("GET /tasks/", tasks_before, tasks_after, iterations)
+    await measure("GET /tasks/?include=", include_before, include_after, iterations)
+    await measure("GET /.../comments", comments_before, comments_after, iterations)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(count, iterations))
@@ -0,0 +1,179 @@
+"""Нагрузочная проверка полнотекстового поиска на локальной БД
+
+Заполняет tasks, notes и comments миллионами строк, распределенных
+между несколькими пользователями, от имени одного из них выполняет SearchServices.search и печатает задержки
+первой и следующих страниц. Все изменения откатываются.
+
+    python -m scripts.bench_search [rows] [users] [iterations]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from core.config import settings
+from core.schemas.users import UserClaims
+from core.services.search import search_services
+
+
+WORDS = [
+    "report",
+    "invoice",
+    "meeting",
+    "deadline",
+    "budget",
+    "release",
+    "review",
+    "backup",
+    "server",
+    "design",
+    "client",
+    "contract",
+    "holiday",
+    "travel",
+    "grocery",
+    "doctor",
+    "birthday",
+    "project",
+    "migration",
+    "database",
+    "frontend",
+    "payment",
+    "refund",
+    "draft",
+]
+
+# Каждое слово встречается примерно в 1/len(WORDS) строк
+PHRASE = (
+    "(ARRAY[{words}])[1 + abs(hashtext(g || '{a}')) % {n}] || ' ' || "
+    "(ARRAY[{words}])[1 + abs(hashtext(g || '{b}')) % {n}] || ' ' || md5(g::text)"
+)
+
+# Строки распределяются по кругу между всеми тестовыми пользователями
+USERS_IDS = (
+    "WITH users_ids AS (SELECT array_agg(id ORDER BY id) AS ids "
+    "FROM users WHERE username LIKE 'search\\_%')"
+)
+
+QUERIES = [
+    "invoice",
+    "deadline budget",
+    '"server backup"',
+    "design -client",
+    "travel or holiday",
+    "nonexistentword",
+]
+
+
+def phrase(a: str, b: str) -> str:
+    words = ", ".join(f"'{word}'" for word in WORDS)
+    return PHRASE.format(words=words, a=a, b=b, n=len(WORDS))
+
+
+def seed_statements() -> list[str]:
+    return [
+        """
+        INSERT INTO users (email, username, hashed_password,
+                           is_active, is_superuser, is_verified)
+        SELECT 'search' || g || '@example.com', 'search_' || g, 'x',
+               true, false, false
+        FROM generate_series(0, :users - 1) g
+        """,
+        f"""
+        {USERS_IDS}
+        INSERT INTO tasks (title, description, is_completed, user_id,
+                           created_at, updated_at)
+        SELECT {phrase("title", "title2")}, {phrase("description", "description2")}, false,
+               u.ids[1 + g % array_length(u.ids, 1)],
+               now() - g * interval '1 second', now()
+        FROM users_ids u, generate_series(1, :rows) g
+        """,
+        f"""
+        {USERS_IDS}
+        INSERT INTO notes (content, is_important, user_id, created_at, updated_at)
+        SELECT {phrase("note", "note2")}, false,
+               u.ids[1 + g % array_length(u.ids, 1)],
+               now() - g * interval '1 second', now()
+        FROM users_ids u, generate_series(1, :rows) g
+        """,
+        f"""
+        INSERT INTO comments (content, user_id, task_id, created_at, updated_at)
+        SELECT {phrase("comment", "comment2")}, t.user_id, t.id, t.created_at, now()
+        FROM tasks t
+        JOIN users u ON u.id = t.user_id AND u.username LIKE 'search\\_%'
+        CROSS JOIN LATERAL (SELECT t.id AS g) s
+        """,
+    ]
+
+
+async def main(rows: int, users: int, iterations: int) -> None:
+    engine = create_async_engine(str(settings.db.url))
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            started = time.perf_counter()
+            # Ищет один пользователь из users, его доля строк - rows / users
+            for statement in seed_statements():
+                await connection.execute(
+                    text(statement), {"rows": rows, "users": users}
+                )
+            for table in ("users", "tasks", "notes", "comments"):
+                await connection.execute(text(f"ANALYZE {table}"))
+            print(
+                f"seeded {rows} rows per table in {time.perf_counter() - started:.1f}s"
+            )
+
+            user = (
+                await connection.execute(
+                    text(
+                        "SELECT id, username, email FROM users "
+                        "WHERE username = 'search_0'"
+                    )
+                )
+            ).one()
+            claims = UserClaims(id=user.id, username=user.username, email=user.email)
+
+            async with AsyncSession(bind=connection) as session:
+                print(
+                    f"{'query':<22}{'hits':>6}{'p50 ms':>10}{'p95 ms':>10}{'page2 ms':>10}"
+                )
+                for query in QUERIES:
+                    timings = []
+                    for _ in range(iterations):
+                        started = time.perf_counter()
+                        hits, cursor = await search_services.search(
+                            query=query, session=session, current_user=claims
+                        )
+                        timings.append((time.perf_counter() - started) * 1000)
+
+                    next_page = 0.0
+                    if cursor:
+                        started = time.perf_counter()
+                        await search_services.search(
+                            query=query,
+                            session=session,
+                            current_user=claims,
+                            cursor=cursor,
+                        )
+                        next_page = (time.perf_counter() - started) * 1000
+
+                    timings.sort()
+                    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                    print(
+                        f"{query:<22}{len(hits):>6}"
+                        f"{statistics.median(timings):>10.1f}{p95:>10.1f}{next_page:>10.1f}"
+                    )
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    asyncio.run(main(rows, users, iterations))
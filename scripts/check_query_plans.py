@@ -0,0 +1,182 @@
+"""Проверка планов запросов сервисов на заполненной локальной БД
+
+Заполняет БД тестовыми данными в транзакции, выполняет запросы сервисов,
+снимает EXPLAIN каждого и падает, если по таблице из списка идет Seq Scan.
+Все изменения откатываются. Схема должна быть накатана миграциями.
+
+    python -m scripts.check_query_plans [users] [rows_per_user]
+"""
+
+import asyncio
+import json
+import sys
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from auth.retention import refresh_token_partitions
+from auth.revocation import RevocationIndex
+from core.config import settings
+from core.schemas.notes import NoteFilters
+from core.schemas.tasks import TaskFilters
+from core.schemas.users import UserClaims
+from core.services.comments import comment_services
+from core.services.notes import note_services
+from core.services.search import search_services
+from core.services.tasks import task_services
+
+
+# По этим таблицам запросы сервисов обязаны идти через индекс
+CHECKED_TABLES = ("users", "tasks", "notes", "comments", "refresh_tokens")
+
+SEED = [
+    """
+    INSERT INTO users (email, username, hashed_password,
+                       is_active, is_superuser, is_verified)
+    SELECT 'plan' || g || '@example.com', 'plan_' || g, 'x', true, false, false
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO tasks (title, is_completed, user_id, created_at, updated_at)
+    SELECT 'task ' || g, g % 3 = 0, u.id,
+           now() - g * interval '1 minute', now()
+    FROM users u CROSS JOIN generate_series(1, :rows) g
+    WHERE u.username LIKE 'plan\\_%'
+    """,
+    """
+    INSERT INTO notes (content, is_important, user_id, created_at, updated_at)
+    SELECT 'note ' || g, g % 5 = 0, u.id,
+           now() - g * interval '1 minute', now()
+    FROM users u CROSS JOIN generate_series(1, :rows) g
+    WHERE u.username LIKE 'plan\\_%'
+    """,
+    """
+    INSERT INTO comments (content, user_id, task_id, created_at, updated_at)
+    SELECT 'comment', t.user_id, t.id, now() - g * interval '1 second', now()
+    FROM tasks t CROSS JOIN generate_series(1, 3) g
+    """,
+    """
+    INSERT INTO comments (content, user_id, note_id, created_at, updated_at)
+    SELECT 'comment', n.user_id, n.id, now() - g * interval '1 second', now()
+    FROM notes n CROSS JOIN generate_series(1, 3) g
+    """,
+    """
+    INSERT INTO refresh_tokens (jti, revoke, revoked_at, expires_at, user_id)
+    SELECT md5(u.id || ':' || g), g % 20 = 0,
+           CASE WHEN g % 20 = 0 THEN now() END,
+           date_trunc('second', now() + (g % 25 + 1) * interval '1 day'), u.id
+    FROM users u CROSS JOIN generate_series(1, :rows) g
+    WHERE u.username LIKE 'plan\\_%'
+    """,
+]
+
+
+def seq_scans(plan: dict) -> list[str]:
+    found = []
+    relation = plan.get("Relation Name", "")
+    if plan["Node Type"] == "Seq Scan" and relation.startswith(CHECKED_TABLES):
+        found.append(relation)
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def seed(connection: AsyncConnection, users: int, rows: int) -> UserClaims:
+    await refresh_token_partitions.ensure_partitions(connection)
+    for statement in SEED:
+        await connection.execute(text(statement), {"users": users, "rows": rows})
+    for table in CHECKED_TABLES:
+        await connection.execute(text(f"ANALYZE {table}"))
+
+    user = (
+        await connection.execute(
+            text(
+                "SELECT id, username, email FROM users "
+                "WHERE username LIKE 'plan\\_%' ORDER BY id LIMIT 1"
+            )
+        )
+    ).one()
+    return UserClaims(id=user.id, username=user.username, email=user.email)
+
+
+async def run_service_queries(session: AsyncSession, user: UserClaims) -> None:
+    tasks, cursor = await task_services.get_all_tasks(
+        session=session, current_user=user
+    )
+    # Вторая страница - запрос с условием по курсору
+    await task_services.get_all_tasks(session=session, current_user=user, cursor=cursor)
+    for filters in (
+        TaskFilters(is_completed=False),
+        TaskFilters(title_prefix="task 1", sort="title"),
+        TaskFilters(sort="-updated_at"),
+    ):
+        await task_services.get_all_tasks(
+            session=session, current_user=user, filters=filters
+        )
+    notes, _ = await note_services.get_all_notes(session=session, current_user=user)
+    await note_services.get_all_notes(
+        session=session,
+        current_user=user,
+        filters=NoteFilters(is_important=True),
+    )
+    await task_services.get_task(
+        task_id=tasks[0].id, session=session, current_user=user
+    )
+    await note_services.get_note(
+        note_id=notes[0].id, session=session, current_user=user
+    )
+    await comment_services.get_task_comments(
+        task_id=tasks[0].id, session=session, current_user=user
+    )
+    await comment_services.get_note_comments(
+        note_id=notes[0].id, session=session, current_user=user
+    )
+    await search_services.search(query="comment", session=session, current_user=user)
+    await RevocationIndex(channel="plan_check").load(session)
+
+
+async def main(users: int, rows: int) -> int:
+    engine = create_async_engine(str(settings.db.url))
+    captured: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    failed = 0
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            user = await seed(connection, users, rows)
+
+            event.listen(engine.sync_engine, "before_cursor_execute", capture)
+            async with AsyncSession(bind=connection) as session:
+                await run_service_queries(session, user)
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+            for statement, parameters in captured:
+                result = await connection.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                )
+                plan = result.scalar_one()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                scans = seq_scans(plan[0]["Plan"])
+                query = " ".join(statement.split())
+                if scans:
+                    failed += 1
+                    print(f"FAIL  Seq Scan on {', '.join(scans)}\n      {query}")
+                else:
+                    print(f"ok    {query[:100]}")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+    print(f"\n{len(captured)} queries, {failed} with sequential scans")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    sys.exit(asyncio.run(main(users, rows)))